@@ -1,5 +1,5 @@
 from Models.administrateur_model import ADMINISTRATEUR
-from Models.database_model import my_session
+from Models.database_model import db_session, read_scope, session_scope
 import logging
 from sqlalchemy.exc import SQLAlchemyError
 import bcrypt
@@ -26,23 +26,24 @@ class ADMINISTRATEUR_CONTROLLER:
                 super_admin=super_admin
             )
 
-            my_session.add(new_admin)
-            my_session.commit()
-            my_session.refresh(new_admin)
+            with session_scope() as session:
+                session.add(new_admin)
+            db_session.refresh(new_admin)
             return new_admin
 
         except (ValueError, SQLAlchemyError) as error:
             logging.error(f"Erreur : {str(error)}")
-            my_session.rollback()
             return None
 
     def get_administrateur_by_id(self, admin_id: int):
         """Récupère un administrateur par son ID."""
-        return my_session.query(ADMINISTRATEUR).filter_by(id=admin_id).first()
+        with read_scope() as session:
+            return session.query(ADMINISTRATEUR).populate_existing().filter_by(id=admin_id).first()
 
     def get_administrateur_by_username(self, username: str):
         """Récupère un administrateur par son nom d'utilisateur."""
-        return my_session.query(ADMINISTRATEUR).filter_by(username=username).first()
+        with read_scope() as session:
+            return session.query(ADMINISTRATEUR).populate_existing().filter_by(username=username).first()
 
     def update_administrateur(self, admin_id: int, **kwargs):
         """Met à jour les informations d'un administrateur."""
@@ -51,16 +52,14 @@ class ADMINISTRATEUR_CONTROLLER:
             if not admin:
                 raise ValueError("Administrateur non trouvé.")
 
-            for key, value in kwargs.items():
-                if hasattr(admin, key):
-                    setattr(admin, key, value)
-
-            my_session.commit()
+            with session_scope():
+                for key, value in kwargs.items():
+                    if hasattr(admin, key):
+                        setattr(admin, key, value)
             return admin
 
         except (ValueError, SQLAlchemyError) as error:
             logging.error(f"Erreur mise à jour : {str(error)}")
-            my_session.rollback()
             return None
 
     def delete_administrateur(self, admin_id: int):
@@ -70,23 +69,23 @@ class ADMINISTRATEUR_CONTROLLER:
             if not admin:
                 raise ValueError("Administrateur introuvable.")
 
-            my_session.delete(admin)
-            my_session.commit()
+            with session_scope() as session:
+                session.delete(admin)
             return True
 
         except (ValueError, SQLAlchemyError) as error:
             logging.error(f"Erreur suppression : {str(error)}")
-            my_session.rollback()
             return False
 
     def get_all_administrateurs(self):
         """Récupère tous les administrateurs."""
-        return my_session.query(ADMINISTRATEUR).all()
+        with read_scope() as session:
+            return session.query(ADMINISTRATEUR).populate_existing().all()
 
     def filter_administrateurs(self, role=None, is_active=None, super_admin=None):
         """Filtre les administrateurs selon leur rôle, statut actif ou super admin."""
         try:
-            query = my_session.query(ADMINISTRATEUR)
+            query = db_session.query(ADMINISTRATEUR).populate_existing()
             if role:
                 query = query.filter_by(role=role)
             if is_active is not None:
@@ -94,7 +93,8 @@ class ADMINISTRATEUR_CONTROLLER:
             if super_admin is not None:
                 query = query.filter_by(super_admin=super_admin)
 
-            return query.all()
+            with read_scope():
+                return query.all()
 
         except SQLAlchemyError as error:
             logging.error(f"Erreur filtrage : {str(error)}")
@@ -105,12 +105,11 @@ class ADMINISTRATEUR_CONTROLLER:
         try:
             admin = self.get_administrateur_by_username(username)
             if admin:
-                admin.last_login = datetime.now()
-                my_session.commit()
+                with session_scope():
+                    admin.last_login = datetime.now()
                 return True
             return False
 
         except SQLAlchemyError as error:
             logging.error(f"Erreur mise à jour du login : {str(error)}")
-            my_session.rollback()
             return False
@@ -0,0 +1,155 @@
+import datetime
+import math
+import time
+
+import numpy as np
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+
+from Controllers.historique_recorder import HISTORIQUE_RECORDER, get_history_recorder
+from Controllers.mq3_sample_buffer import MQ3_SAMPLE_DTYPE
+
+RESULTAT_NEGATIF = "NEGATIF"
+RESULTAT_POSITIF = "POSITIF"
+RESULTAT_SANS_MESURE = "SANS_MESURE"
+
+
+def summarize_samples(samples, threshold, min_over_s, sample_period):
+    """
+    Résume les mesures MQ3 d'un test (tableau MQ3_SAMPLE_DTYPE) : pic, moyenne, durée
+    au-dessus du seuil et verdict. Les mesures d'une même lecture série partagent leur
+    horodatage de réception : la durée est donc comptée en périodes d'échantillonnage de
+    l'Arduino (sample_period), pas déduite des horodatages. Trop peu de mesures pour
+    atteindre min_over_s donne SANS_MESURE (test non concluant), jamais NEGATIF.
+    """
+    if not len(samples):
+        return {"resultat": RESULTAT_SANS_MESURE, "alcool_max": None, "alcool_moyen": None,
+                "duree_depassement": None, "mesures": 0}
+    values = samples["alcohol"].astype(np.float64)
+    over_s = float(np.count_nonzero(values >= threshold) * sample_period)
+    if over_s >= min_over_s:
+        resultat = RESULTAT_POSITIF
+    elif len(samples) < math.ceil(min_over_s / sample_period - 1e-9):
+        resultat = RESULTAT_SANS_MESURE
+    else:
+        resultat = RESULTAT_NEGATIF
+    return {
+        "resultat": resultat,
+        "alcool_max": float(values.max()),
+        "alcool_moyen": float(values.mean()),
+        "duree_depassement": round(over_s, 2),
+        "mesures": len(samples),
+    }
+
+
+class ALCOOL_TEST_CONTROLLER(QObject):
+    """
+    Test d'alcool d'un chauffeur au point de contrôle, piloté par les événements :
+    la reconnaissance d'un chauffeur (on_driver_recognized) ouvre une fenêtre de mesure,
+    les lots de mesures MQ3 du contrôleur Arduino (samples_received) y sont rangés au fil
+    de l'eau, et un minuteur clôt la fenêtre : le verdict est inscrit dans HISTORIQUE
+    (une ligne TEST_ALCOOL) par l'enregistreur groupé. Aucune boucle d'attente : tout
+    s'exécute dans la boucle d'événements Qt, en quelques microsecondes par événement.
+
+    États : ATTENTE -> MESURE -> ATTENTE. Un seul test à la fois ; un chauffeur déjà
+    testé n'en relance pas avant cooldown_s secondes (il reste devant la caméra).
+    """
+
+    # Émis à l'ouverture d'un test : identifiant et nom du chauffeur
+    session_started = Signal(int, str)
+    # Émis à la clôture : verdict (voir summarize_samples) avec chauffeur_id, nom et debut
+    session_finished = Signal(object)
+
+    STATE_IDLE = "ATTENTE"
+    STATE_MEASURING = "MESURE"
+
+    # Seuil défini dans le programme Arduino (voir Mq3ValueGui.SEUIL_ALCOOL)
+    SEUIL_ALCOOL = 400
+    WINDOW_S = 5.0
+    # Le lecteur série émet ses mesures par lots : on attend les dernières avant de conclure
+    SETTLE_S = 0.3
+    # Durée au-dessus du seuil à partir de laquelle le test est positif (ignore les pics isolés)
+    MIN_OVER_S = 0.5
+    # Période d'envoi des mesures par le programme Arduino (10 mesures par seconde)
+    SAMPLE_PERIOD_S = 0.1
+    COOLDOWN_S = 60.0
+
+    def __init__(self, arduino_controller=None, history_recorder=None, threshold=SEUIL_ALCOOL,
+                 window_s=WINDOW_S, min_over_s=MIN_OVER_S, sample_period=SAMPLE_PERIOD_S,
+                 cooldown_s=COOLDOWN_S, parent=None):
+        super().__init__(parent)
+        self.history_recorder = history_recorder or get_history_recorder()
+        self.threshold = threshold
+        self.window_s = window_s
+        self.min_over_s = min_over_s
+        self.sample_period = sample_period
+        self.cooldown_s = cooldown_s
+        self.state = self.STATE_IDLE
+        self.session = None
+        self._last_tested = {}  # {chauffeur_id: instant monotone du dernier verdict}
+
+        self._window_timer = QTimer(self)
+        self._window_timer.setSingleShot(True)
+        self._window_timer.timeout.connect(self._finish_session)
+
+        if arduino_controller is not None:
+            self.attach(arduino_controller)
+
+    def attach(self, arduino_controller):
+        """Reçoit les mesures du contrôleur Arduino, décodées par lots dans son thread de lecture."""
+        arduino_controller.enable_batching()
+        arduino_controller.samples_received.connect(self.on_samples_received)
+
+    @Slot(int, str, float)
+    def on_driver_recognized(self, chauffeur_id, name, score):
+        """Ouvre un test pour le chauffeur reconnu, sauf test en cours ou chauffeur testé récemment."""
+        if self.state != self.STATE_IDLE:
+            return
+        last = self._last_tested.get(chauffeur_id)
+        if last is not None and time.monotonic() - last < self.cooldown_s:
+            return
+        start = time.time()
+        self.session = {
+            "chauffeur_id": chauffeur_id,
+            "nom": name,
+            "score": score,
+            "debut": datetime.datetime.fromtimestamp(start),
+            "start": start,
+            "end": start + self.window_s,
+            "chunks": [],
+        }
+        self.state = self.STATE_MEASURING
+        self._window_timer.start(int((self.window_s + self.SETTLE_S) * 1000))
+        self.session_started.emit(chauffeur_id, name)
+
+    @Slot(object)
+    def on_samples_received(self, samples):
+        if self.state != self.STATE_MEASURING:
+            return
+        timestamps = samples["timestamp"]
+        in_window = (timestamps >= self.session["start"]) & (timestamps <= self.session["end"])
+        if in_window.any():
+            self.session["chunks"].append(samples[in_window])
+
+    def cancel(self):
+        """Abandonne le test en cours sans rien enregistrer."""
+        self._window_timer.stop()
+        self.session = None
+        self.state = self.STATE_IDLE
+
+    def _finish_session(self):
+        session = self.session
+        if session is None:
+            return
+        chunks = session["chunks"]
+        samples = np.concatenate(chunks) if chunks else np.empty(0, dtype=MQ3_SAMPLE_DTYPE)
+        verdict = summarize_samples(samples, self.threshold, self.min_over_s, self.sample_period)
+        self.history_recorder.record(
+            session["chauffeur_id"], HISTORIQUE_RECORDER.EVENT_TEST_ALCOOL, jour_heure=session["debut"],
+            resultat=verdict["resultat"], alcool_max=verdict["alcool_max"],
+            alcool_moyen=verdict["alcool_moyen"], duree_depassement=verdict["duree_depassement"],
+        )
+        self._last_tested[session["chauffeur_id"]] = time.monotonic()
+        self.session = None
+        self.state = self.STATE_IDLE
+        verdict.update(chauffeur_id=session["chauffeur_id"], nom=session["nom"], debut=session["debut"])
+        self.session_finished.emit(verdict)
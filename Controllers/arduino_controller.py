@@ -1,20 +1,66 @@
+import json
+import time
+
+import numpy as np
 import serial
 import serial.tools.list_ports
 from PySide6.QtCore import QObject, QThread, Signal, Slot
 
+from Controllers.mq3_sample_buffer import MQ3_SAMPLE_DTYPE, parse_mq3_line
+from Controllers.serial_framing import BinaryFramer, LineFramer, frames_to_samples
+
 class ArduinoController(QObject):
     # Signal émis lorsqu'une ligne de données est reçue (format texte brut)
     data_received = Signal(str)
     # Signal émis lorsque l'état de connexion change (True si connecté, False sinon)
     connection_status_changed = Signal(bool)
+    # Mode groupé (enable_batching) : mesures MQ3 déjà décodées, en tableau NumPy
+    # (MQ3_SAMPLE_DTYPE), et lignes qui ne sont pas des mesures, au plus une fois par batch_interval
+    samples_received = Signal(object)
+    lines_received = Signal(list)
+
+    BAUDRATE = 9600
+    # Protocoles : lignes JSON (historique, par défaut) ou trames binaires négociées au
+    # démarrage de la lecture ("auto", programme Arduino compatible requis), avec repli
+    # sur le JSON si l'Arduino ne répond pas
+    PROTOCOL_JSON = "json"
+    PROTOCOL_BINARY = "binary"
+    PROTOCOL_AUTO = "auto"
+    BINARY_BAUDRATE = 115200
+    # Négociation : "BIN <débit>\n" est renvoyé toutes les NEGOTIATION_RETRY secondes
+    # (l'Arduino redémarre à l'ouverture du port) jusqu'à la réponse "OK BIN <débit>"
+    NEGOTIATION_TIMEOUT = 3.0
+    NEGOTIATION_RETRY = 1.0
+    # Sans trame valide pendant ce délai (après le changement de débit, ou plus tard si
+    # l'Arduino redémarre et reparle en JSON à BAUDRATE), retour au JSON
+    BINARY_CHECK_TIMEOUT = 1.0
+    # Durée maximale d'une lecture bloquante : le thread dort en attendant les octets
+    # et vérifie l'arrêt demandé au moins aussi souvent
+    READ_TIMEOUT = 0.1
+    # Intervalle minimal entre deux émissions groupées (20 par seconde au plus)
+    BATCH_INTERVAL = 0.05
 
-    def __init__(self, port_combobox=None, status_label=None):
+    def __init__(self, port_combobox=None, status_label=None, protocol=PROTOCOL_JSON,
+                 baudrate=BAUDRATE, binary_baudrate=BINARY_BAUDRATE):
         super().__init__()
         self.port_combobox = port_combobox              # Référence au menu déroulant (QComboBox)
         self.status_label = status_label                # Référence à l'étiquette de statut (QLabel)
         self.serial_connection = None                   # Objet Serial pour la communication
         self.reader_thread = QThread()                  # Thread séparé pour la lecture série
         self.reading = False                            # Indicateur de lecture active
+        self.protocol = protocol                        # Protocole demandé (json ou auto)
+        self.baudrate = baudrate                        # Débit du protocole JSON
+        self.binary_baudrate = binary_baudrate          # Débit demandé pour les trames binaires
+        self.active_protocol = self.PROTOCOL_JSON       # Protocole effectivement utilisé
+        self.framer = LineFramer()                      # Découpage du flux d'octets (lignes ou trames)
+        self._binary_check_deadline = None
+        self._binary_frames_seen = False
+        self.batching = False                           # Mode groupé (voir enable_batching)
+        self.batch_interval = self.BATCH_INTERVAL
+        self._pending_samples = []
+        self._pending_arrays = []
+        self._pending_lines = []
+        self._last_batch = 0.0
         self.moveToThread(self.reader_thread)           # Déplace l'objet vers le thread secondaire
         self.reader_thread.started.connect(self._read_loop)  # Lance la boucle de lecture à l'activation
 
@@ -44,7 +90,7 @@ class ArduinoController(QObject):
 
         port = selected.split(" - ")[0]
         try:
-            self.serial_connection = serial.Serial(port, baudrate=9600, timeout=1)
+            self.serial_connection = serial.Serial(port, baudrate=self.baudrate, timeout=self.READ_TIMEOUT)
             self._update_status(f"🟢 Connecté à {port}", "green")
             if self.port_combobox:
                 self.port_combobox.clear()
@@ -77,19 +123,177 @@ class ArduinoController(QObject):
 
     @Slot()
     def _read_loop(self):
-        # Boucle qui lit les données en provenance de l'Arduino en continu
+        # Lecture bloquante (au plus READ_TIMEOUT) : sans données, le thread dort au lieu
+        # de scruter in_waiting en boucle. Les octets sont découpés par le framer du protocole actif.
+        self._use_json()
+        if self.protocol == self.PROTOCOL_AUTO:
+            self._negotiate_binary()
         while self.reading and self.is_connected():
-            try:
-                if self.serial_connection.in_waiting:
-                    line = self.serial_connection.readline().decode("utf-8").strip()
-                    if line:
-                        self.data_received.emit(line)  # Émet la ligne reçue via signal
-            except Exception as e:
-                print(f"[Erreur de lecture] {e}")
+            data = self._read_chunk()
+            if data is None:
+                break
+            if data:
+                if self.active_protocol == self.PROTOCOL_BINARY:
+                    self._handle_frames(data, time.time())
+                else:
+                    self._handle_lines(self.framer.feed(data), time.time())
+            if self._binary_check_deadline is not None and time.monotonic() > self._binary_check_deadline:
+                self._binary_fallback()
+            if self.batching:
+                self._flush_batch()
+        self._flush_batch(force=True)
+        # Fin de lecture : le thread s'arrête pour qu'une reconnexion puisse le relancer
+        self.reader_thread.quit()
+
+    def _read_chunk(self):
+        # Retourne les octets disponibles (éventuellement aucun), ou None si le port est perdu
+        try:
+            waiting = self.serial_connection.in_waiting
+            if self._has_pending():
+                # Lot en attente : inutile de se réveiller avant son émission, les octets
+                # s'accumulent dans le tampon du système et sont lus en une fois
+                remaining = self._last_batch + self.batch_interval - time.monotonic()
+                if remaining > 0:
+                    time.sleep(min(remaining, self.READ_TIMEOUT))
+                    waiting = self.serial_connection.in_waiting
+                return self.serial_connection.read(waiting)
+            return self.serial_connection.read(waiting or 1)
+        except (serial.SerialException, OSError) as e:
+            # Port débranché ou fermé : inutile de réessayer en boucle
+            print(f"[Erreur de lecture] {e}")
+            self.reading = False
+            self._emit_connection_status(False)
+            return None
+
+    def _negotiate_binary(self):
+        """
+        Propose le protocole binaire à l'Arduino ("BIN <débit>") et bascule si celui-ci
+        répond "OK BIN <débit>". Les lignes JSON reçues pendant l'attente sont traitées
+        normalement ; sans réponse (ancien programme Arduino), la lecture continue en JSON.
+        """
+        command = f"BIN {self.binary_baudrate}\n"
+        ack = f"OK BIN {self.binary_baudrate}"
+        deadline = time.monotonic() + self.NEGOTIATION_TIMEOUT
+        next_attempt = 0.0
+        while self.reading and self.is_connected() and time.monotonic() < deadline:
+            if time.monotonic() >= next_attempt:
+                self.send_command(command)
+                next_attempt = time.monotonic() + self.NEGOTIATION_RETRY
+            data = self._read_chunk()
+            if data is None:
+                return False
+            lines = self.framer.feed(data) if data else []
+            if ack in lines:
+                self._handle_lines(lines[:lines.index(ack)], time.time())
+                self._use_binary()
+                return True
+            self._handle_lines(lines, time.time())
+            if self.batching:
+                self._flush_batch()
+        return False
+
+    def _binary_fallback(self):
+        # Plus de trame valide : retour aux lignes JSON. Si le binaire avait fonctionné,
+        # l'Arduino a sans doute redémarré (il repart en JSON) : la négociation est relancée.
+        renegotiate = self._binary_frames_seen and self.protocol == self.PROTOCOL_AUTO
+        print("[Arduino] Aucune trame binaire valide reçue, retour aux lignes JSON")
+        self.send_command("JSON\n")
+        self._use_json()
+        if renegotiate:
+            self._negotiate_binary()
+
+    def _use_json(self):
+        self.active_protocol = self.PROTOCOL_JSON
+        self.framer = LineFramer()
+        self._binary_check_deadline = None
+        if self.is_connected() and self.serial_connection.baudrate != self.baudrate:
+            self.serial_connection.baudrate = self.baudrate
+
+    def _use_binary(self):
+        # L'Arduino change de débit juste après sa réponse : les octets déjà reçus sont
+        # jetés, le framer binaire se resynchronise sur les trames suivantes
+        self.serial_connection.baudrate = self.binary_baudrate
+        self.serial_connection.reset_input_buffer()
+        self.active_protocol = self.PROTOCOL_BINARY
+        self.framer = BinaryFramer()
+        self._binary_frames_seen = False
+        self._binary_check_deadline = time.monotonic() + self.BINARY_CHECK_TIMEOUT
+        print(f"[Arduino] Protocole binaire actif à {self.binary_baudrate} bauds")
+
+    def _handle_lines(self, lines, received_at):
+        for line in lines:
+            self.data_received.emit(line)  # Émet la ligne reçue via signal
+            if self.batching:
+                sample = parse_mq3_line(line, received_at)
+                if sample is None:
+                    self._pending_lines.append(line)
+                else:
+                    self._pending_samples.append(sample)
+
+    def _handle_frames(self, data, received_at):
+        frames = self.framer.feed(data)
+        if not len(frames):
+            return
+        # Chien de garde : le délai repart à chaque trame valide
+        self._binary_frames_seen = True
+        self._binary_check_deadline = time.monotonic() + self.BINARY_CHECK_TIMEOUT
+        samples = frames_to_samples(frames, received_at)
+        if self.batching:
+            self._pending_arrays.append(samples)
+        # Comme en JSON, les abonnés de data_received reçoivent une ligne par mesure
+        for sample in samples:
+            self.data_received.emit(json.dumps({
+                "alcohol": int(sample["alcohol"]), "digital": int(sample["digital"]), "alert": bool(sample["alert"]),
+            }))
+
+    def framing_stats(self):
+        """Compteurs d'erreurs du protocole binaire (vides en JSON)."""
+        if isinstance(self.framer, BinaryFramer):
+            return {"crc_errors": self.framer.crc_errors, "skipped_bytes": self.framer.skipped_bytes,
+                    "lost_frames": self.framer.lost_frames}
+        return {}
+
+    def enable_batching(self, interval=None):
+        """
+        Active le mode groupé : les lignes sont décodées dans le thread de lecture et
+        émises par lots (samples_received, lines_received) au plus une fois par interval
+        secondes. À haut débit, l'interface reçoit ainsi quelques événements par seconde
+        au lieu d'un par ligne. data_received reste émis pour les abonnés existants,
+        quel que soit le protocole.
+        """
+        if interval is not None:
+            self.batch_interval = interval
+        self.batching = True
+
+    def disable_batching(self):
+        self.batching = False
+
+    def _has_pending(self):
+        return bool(self._pending_samples or self._pending_arrays or self._pending_lines)
+
+    def _flush_batch(self, force=False):
+        if not self._has_pending():
+            return
+        now = time.monotonic()
+        if not force and now - self._last_batch < self.batch_interval:
+            return
+        self._last_batch = now
+        if self._pending_samples:
+            self._pending_arrays.append(np.array(self._pending_samples, dtype=MQ3_SAMPLE_DTYPE))
+            self._pending_samples = []
+        if self._pending_arrays:
+            arrays = self._pending_arrays
+            self._pending_arrays = []
+            self.samples_received.emit(np.concatenate(arrays) if len(arrays) > 1 else arrays[0])
+        if self._pending_lines:
+            self.lines_received.emit(self._pending_lines)
+            self._pending_lines = []
 
     def stop_reading(self):
         # Arrête proprement la lecture et le thread associé
         self.reading = False
+        if self.is_connected() and hasattr(self.serial_connection, "cancel_read"):
+            self.serial_connection.cancel_read()  # Débloque immédiatement la lecture en cours
         if self.reader_thread.isRunning():
             self.reader_thread.quit()
             self.reader_thread.wait()
@@ -0,0 +1,84 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
+
+class BatchQueueWriter:
+    """
+    Base des écrivains asynchrones : put() dépose un élément dans une file, un thread
+    dédié (démarré au premier élément) les regroupe et appelle write_batch() tous les
+    batch_size éléments ou toutes les flush_interval secondes. close() vide la file ;
+    un élément déposé ensuite n'a plus de thread pour l'écrire et est ignoré (journalisé).
+    """
+
+    thread_name = "batch-writer"
+
+    def __init__(self, batch_size=100, flush_interval=1.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._closed = False
+        atexit.register(self.close)
+
+    def put(self, item):
+        # Sous le verrou de close() : l'élément est dans la file avant le signal d'arrêt,
+        # ou bien l'écrivain est fermé et l'élément est ignoré, jamais perdu en silence
+        with self._thread_lock:
+            if self._closed:
+                logging.warning(f"Élément ignoré : {self.thread_name} est fermé")
+                return
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._writer_loop, name=self.thread_name, daemon=True)
+                self._thread.start()
+            self._queue.put(item)
+
+    def open_writer(self):
+        """Appelé dans le thread d'écriture avant le premier lot (ex. ouvrir une session)."""
+
+    def close_writer(self):
+        """Appelé dans le thread d'écriture à l'arrêt."""
+
+    def write_batch(self, items):
+        raise NotImplementedError
+
+    def _writer_loop(self):
+        self.open_writer()
+        try:
+            stop = False
+            while not stop:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                items = []
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is None:
+                        stop = True
+                        break
+                    items.append(item)
+                    if len(items) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                if items:
+                    self.write_batch(items)
+        finally:
+            self.close_writer()
+
+    def close(self, timeout=10):
+        """Écrit les éléments en attente et arrête le thread d'écriture."""
+        with self._thread_lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout=timeout)
@@ -4,6 +4,8 @@ import cv2
 import os
 import numpy as np
 
+from Controllers.camera_discovery_controller import CameraDiscoveryController
+
 class CameraController:
     def __init__(self, view):
         """Initialisation du contrôleur avec une référence à la vue."""
@@ -18,23 +20,20 @@ class CameraController:
         self.is_recognizing = False
         self.camera_active = False
 
+        self.camera_discovery = CameraDiscoveryController()
+        self.camera_discovery.cameras_found.connect(self.view.update_camera_list)
+
         self._populate_camera_list()
         self._start_default_camera()
 
     def _populate_camera_list(self):
-        """Détecte et peuple la liste des caméras connectées."""
-        available_cameras = self._get_connected_cameras()
-        self.view.update_camera_list(available_cameras)
+        """Détecte les caméras connectées en arrière-plan ; la vue est mise à jour à la fin de la recherche."""
+        self.camera_discovery.discover()
 
     def _get_connected_cameras(self):
-        """Détecte les caméras connectées."""
-        available_cameras = {}
-        for i in range(10):
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                available_cameras[i] = f"Caméra {i}"
-                cap.release()
-        return available_cameras
+        """Détecte les caméras connectées (bloquant, utilise le cache si disponible)."""
+        cached = self.camera_discovery.cached_cameras()
+        return dict(cached) if cached is not None else self.camera_discovery.scan()
 
     def _start_default_camera(self):
         self._start_camera(0)
@@ -0,0 +1,112 @@
+import glob
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import cv2
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+class CameraDiscoveryController(QObject):
+    """
+    Recherche des caméras locales en arrière-plan.
+    Sous Linux, les périphériques sont énumérés directement via /dev/video* (V4L2)
+    au lieu d'ouvrir les indices un par un ; chaque candidat est ensuite sondé en
+    parallèle avec un délai maximum. Le résultat est mis en cache pour tout le processus.
+    """
+    # Signal émis avec le dictionnaire {indice: libellé} des caméras trouvées. Déclaré
+    # object : un argument dict devient un QVariantMap, qui perd les clés entières
+    cameras_found = Signal(object)
+
+    _cache = None
+    _cache_time = 0.0
+    _cache_lock = threading.Lock()
+
+    def __init__(self, probe_timeout=2.0, cache_ttl=300.0, max_indices=10):
+        super().__init__()
+        self.probe_timeout = probe_timeout  # Délai maximum de la recherche (secondes)
+        self.cache_ttl = cache_ttl          # Durée de validité du cache (secondes)
+        self.max_indices = max_indices      # Indices essayés hors Linux
+
+    def discover(self, force=False):
+        """Lance la recherche en arrière-plan ; cameras_found est émis à la fin (ou tout de suite si en cache)."""
+        cached = self.cached_cameras()
+        if cached is not None and not force:
+            # Émission différée pour garder le même comportement asynchrone qu'une vraie recherche
+            QTimer.singleShot(0, lambda: self.cameras_found.emit(dict(cached)))
+            return
+        threading.Thread(target=self._run, name="camera-discovery", daemon=True).start()
+
+    def cached_cameras(self):
+        """Retourne le dernier résultat s'il est encore valide, sinon None."""
+        with self._cache_lock:
+            cls = type(self)
+            if cls._cache is not None and time.monotonic() - cls._cache_time < self.cache_ttl:
+                return cls._cache
+        return None
+
+    def _run(self):
+        cameras = self.scan()
+        with self._cache_lock:
+            cls = type(self)
+            cls._cache = cameras
+            cls._cache_time = time.monotonic()
+        self.cameras_found.emit(dict(cameras))
+
+    def scan(self):
+        """Énumère puis sonde les candidats en parallèle ; bloquant, à appeler hors du thread graphique."""
+        candidates = self.list_candidates()
+        if not candidates:
+            return {}
+
+        executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="camera-probe")
+        futures = {executor.submit(self.probe, index): (index, label) for index, label in candidates}
+        done, _ = wait(futures, timeout=self.probe_timeout)
+        # Les sondes bloquées ne sont pas attendues : le thread se terminera seul
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        cameras = {}
+        for future in done:
+            index, label = futures[future]
+            if not future.exception() and future.result():
+                cameras[index] = label
+        return dict(sorted(cameras.items()))
+
+    def list_candidates(self):
+        """Liste les (indice, libellé) susceptibles d'être des caméras, sans les ouvrir."""
+        if sys.platform.startswith("linux") and os.path.isdir("/dev"):
+            candidates = []
+            for path in glob.glob("/dev/video*"):
+                match = re.fullmatch(r"/dev/video(\d+)", path)
+                if not match:
+                    continue
+                index = int(match.group(1))
+                sys_dir = f"/sys/class/video4linux/video{index}"
+                # Un même appareil expose souvent un nœud de métadonnées (index 1) inutilisable
+                if self._read_sysfs(os.path.join(sys_dir, "index")) not in (None, "0"):
+                    continue
+                name = self._read_sysfs(os.path.join(sys_dir, "name"))
+                candidates.append((index, f"Caméra {index}" + (f" - {name}" if name else "")))
+            return sorted(candidates)
+        return [(index, f"Caméra {index}") for index in range(self.max_indices)]
+
+    @staticmethod
+    def _read_sysfs(path):
+        try:
+            with open(path) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    @staticmethod
+    def probe(index):
+        """Vérifie qu'un indice de caméra peut être ouvert."""
+        backend = cv2.CAP_V4L2 if sys.platform.startswith("linux") else cv2.CAP_ANY
+        cap = cv2.VideoCapture(index, backend)
+        try:
+            return cap.isOpened()
+        finally:
+            cap.release()
@@ -1,5 +1,6 @@
 from Models.chauffeur_model import CHAUFFEUR
-from Models.database_model import my_session
+from Models.database_model import db_session, read_scope, session_scope
+from Controllers.pagination import DEFAULT_PAGE_SIZE, keyset_page, iter_keyset, stream, safe_iter
 
 
 class CHAUFFEUR_CONTROLLER:
@@ -16,9 +17,9 @@ class CHAUFFEUR_CONTROLLER:
                 sex=sex,
             )
 
-            my_session.add(new_chauffeur)
-            my_session.commit()
-            my_session.refresh(new_chauffeur)
+            with session_scope() as session:
+                session.add(new_chauffeur)
+            db_session.refresh(new_chauffeur)
             return new_chauffeur
         except Exception as e:
             print(f"Erreur d'enregistrement du chauffeur : {str(e)}")
@@ -28,18 +29,37 @@ class CHAUFFEUR_CONTROLLER:
         """🔹 Récupérer tous les chauffeurs."""
         try:
 
-            return my_session.query(CHAUFFEUR).all()
+            with read_scope() as session:
+                return session.query(CHAUFFEUR).populate_existing().order_by(CHAUFFEUR.id).all()
         except Exception as e:
             print(f"Erreur de récupération des chauffeurs : {str(e)}")
             return []
 
-    def get_driver_by_id(self, chauffeur_id):
-        """🔹 Récupérer un chauffeur par son identifiant."""
+    def get_drivers_page(self, after_id=None, page_size=DEFAULT_PAGE_SIZE):
+        """🔹 Récupérer la page de chauffeurs d'id strictement supérieur à after_id."""
         try:
-            chauffeur = my_session.query(CHAUFFEUR).filter(CHAUFFEUR.id == chauffeur_id).first()
-            return chauffeur
+            return keyset_page(db_session.query(CHAUFFEUR), CHAUFFEUR.id, after_id, page_size)
+        except Exception as e:
+            print(f"Erreur de récupération des chauffeurs : {str(e)}")
+            return []
+
+    def iter_drivers(self, page_size=DEFAULT_PAGE_SIZE):
+        """🔹 Parcourir tous les chauffeurs page par page (mémoire bornée)."""
+        return safe_iter(iter_keyset(db_session.query(CHAUFFEUR), CHAUFFEUR.id, page_size), "chauffeurs")
+
+    def stream_drivers(self, batch_size=DEFAULT_PAGE_SIZE):
+        """🔹 Parcourir tous les chauffeurs en une seule requête à curseur serveur."""
+        return safe_iter(stream(db_session.query(CHAUFFEUR).order_by(CHAUFFEUR.id), batch_size), "chauffeurs")
+
+    def get_driver_by_id(self, chauffeur_id, raise_errors=False):
+        """🔹 Récupérer un chauffeur par son identifiant (raise_errors : une erreur de base est relevée au lieu de donner None)."""
+        try:
+            with read_scope() as session:
+                return session.query(CHAUFFEUR).populate_existing().filter(CHAUFFEUR.id == chauffeur_id).first()
         except Exception as e:
             print(f"Erreur de récupération du chauffeur : {str(e)}")
+            if raise_errors:
+                raise
             return None
 
     def update_driver(
@@ -57,27 +77,27 @@ class CHAUFFEUR_CONTROLLER:
         try:
 
             chauffeur = (
-                my_session.query(CHAUFFEUR).filter(CHAUFFEUR.id == chauffeur_id).first()
+                db_session.query(CHAUFFEUR).filter(CHAUFFEUR.id == chauffeur_id).first()
             )
             if not chauffeur:
                 return None
 
-            if nom:
-                chauffeur.nom = nom
-            if postnom:
-                chauffeur.postnom = postnom
-            if prenom:
-                chauffeur.prenom = prenom
-            if telephone:
-                chauffeur.telephone = telephone
-            if email:
-                chauffeur.email = email
-            if numero_permis:
-                chauffeur.numero_permis = numero_permis
-            if sex:
-                chauffeur.sex=sex
-            my_session.commit()
-            my_session.refresh(chauffeur)
+            with session_scope():
+                if nom:
+                    chauffeur.nom = nom
+                if postnom:
+                    chauffeur.postnom = postnom
+                if prenom:
+                    chauffeur.prenom = prenom
+                if telephone:
+                    chauffeur.telephone = telephone
+                if email:
+                    chauffeur.email = email
+                if numero_permis:
+                    chauffeur.numero_permis = numero_permis
+                if sex:
+                    chauffeur.sex=sex
+            db_session.refresh(chauffeur)
             return chauffeur
         except Exception as e:
             print(f"Erreur de mise à jour : {str(e)}")
@@ -88,13 +108,13 @@ class CHAUFFEUR_CONTROLLER:
         try:
 
             chauffeur = (
-                my_session.query(CHAUFFEUR).filter(CHAUFFEUR.id == chauffeur_id).first()
+                db_session.query(CHAUFFEUR).filter(CHAUFFEUR.id == chauffeur_id).first()
             )
             if not chauffeur:
                 return False
 
-            my_session.delete(chauffeur)
-            my_session.commit()
+            with session_scope() as session:
+                session.delete(chauffeur)
             return True
         except Exception as e:
             print(f"Erreur de suppression : {str(e)}")
@@ -0,0 +1,105 @@
+import logging
+import os
+import numpy as np
+from Models.embedding_model import EMBEDDING_VISAGE
+from Models.database_model import read_scope, session_scope
+
+
+class EMBEDDING_CONTROLLER:
+    """Cache persistant des embeddings de visages, indexé par image et par modèle."""
+
+    @staticmethod
+    def file_signature(path):
+        """Retourne (mtime en nanosecondes, taille) du fichier, ou None s'il est inaccessible."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def is_fresh(entry, path, signature):
+        """Indique si l'entrée du cache correspond encore au fichier sur le disque."""
+        return (entry is not None and signature is not None
+                and entry.chemin == path
+                and entry.mtime_ns == signature[0]
+                and entry.taille == signature[1])
+
+    @staticmethod
+    def to_vector(entry):
+        """Décode le vecteur stocké (float32) ou retourne None si l'image n'a pas de visage."""
+        if entry is None or entry.vecteur is None:
+            return None
+        return np.frombuffer(entry.vecteur, dtype=np.float32)
+
+    def get_embeddings_by_model(self, model_name, raise_errors=False):
+        """
+        Récupère toutes les entrées d'un modèle sous forme de dictionnaire {image_id: entrée}.
+        Avec raise_errors, une erreur de base est relevée au lieu de donner un cache vide
+        (qui ferait tout ré-encoder).
+        """
+        try:
+            with read_scope() as session:
+                entries = session.query(EMBEDDING_VISAGE).populate_existing().filter_by(modele=model_name).all()
+            return {entry.image_id: entry for entry in entries}
+        except Exception as e:
+            logging.error(f"Erreur lors de la récupération des embeddings : {e}")
+            if raise_errors:
+                raise
+            return {}
+
+    def get_embeddings_for_images(self, image_ids, model_name):
+        """Récupère les entrées d'un modèle pour quelques images seulement : {image_id: entrée}."""
+        image_ids = list(image_ids)
+        if not image_ids:
+            return {}
+        try:
+            with read_scope() as session:
+                entries = (session.query(EMBEDDING_VISAGE).populate_existing()
+                           .filter(EMBEDDING_VISAGE.modele == model_name, EMBEDDING_VISAGE.image_id.in_(image_ids))
+                           .all())
+            return {entry.image_id: entry for entry in entries}
+        except Exception as e:
+            logging.error(f"Erreur lors de la récupération des embeddings : {e}")
+            return {}
+
+    def save_embeddings(self, records, model_name):
+        """
+        Enregistre ou met à jour plusieurs embeddings en une seule transaction.
+        records : itérable de (image_id, chemin, (mtime_ns, taille), embedding ou None).
+        """
+        try:
+            records = list(records)
+            if not records:
+                return True
+            image_ids = [record[0] for record in records]
+            with session_scope() as session:
+                existing = {
+                    entry.image_id: entry
+                    for entry in session.query(EMBEDDING_VISAGE)
+                    .filter(EMBEDDING_VISAGE.modele == model_name, EMBEDDING_VISAGE.image_id.in_(image_ids))
+                }
+                for image_id, path, (mtime_ns, size), embedding in records:
+                    entry = existing.get(image_id)
+                    if entry is None:
+                        entry = EMBEDDING_VISAGE(image_id=image_id, modele=model_name)
+                        session.add(entry)
+                    entry.chemin = path
+                    entry.mtime_ns = mtime_ns
+                    entry.taille = size
+                    entry.vecteur = (np.asarray(embedding, dtype=np.float32).tobytes()
+                                     if embedding is not None else None)
+            return True
+        except Exception as e:
+            logging.error(f"Erreur lors de l'enregistrement des embeddings : {e}")
+            return False
+
+    def delete_embeddings(self, image_id):
+        """Supprime les embeddings d'une image pour tous les modèles."""
+        try:
+            with session_scope() as session:
+                session.query(EMBEDDING_VISAGE).filter_by(image_id=image_id).delete()
+            return True
+        except Exception as e:
+            logging.error(f"Erreur lors de la suppression des embeddings : {e}")
+            return False
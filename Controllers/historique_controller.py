@@ -1,5 +1,9 @@
-from Models.database_model import my_session
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload
+
+from Models.database_model import db_session, read_scope, session_scope
 from Models.historitique_model import HISTORIQUE
+from Controllers.pagination import DEFAULT_PAGE_SIZE, keyset_page, iter_keyset, stream, safe_iter
 
 import logging
 
@@ -10,9 +14,9 @@ class HISTORIQUE_CONTROLLER:
         """Ajoute un nouvel événement historique."""
         try:
             new = HISTORIQUE(jour_heure=jour_heure, event_type=event_type)
-            my_session.add(new)
-            my_session.commit()
-            my_session.refresh(new)
+            with session_scope() as session:
+                session.add(new)
+            db_session.refresh(new)
             return new
         except Exception as e:
             logging.error(
@@ -20,15 +24,33 @@ class HISTORIQUE_CONTROLLER:
 
     def get_histories(self):
         try:
-            return my_session.query(HISTORIQUE).all()
+            with read_scope() as session:
+                return session.query(HISTORIQUE).populate_existing().order_by(HISTORIQUE.id).all()
         except Exception as e:
             logging.error(f"Erreur de chargement des historiques: {e}")
             return None
 
+    def get_histories_page(self, after_id=None, page_size=DEFAULT_PAGE_SIZE):
+        """Page d'événements d'id strictement supérieur à after_id (pagination par clé)."""
+        try:
+            return keyset_page(db_session.query(HISTORIQUE), HISTORIQUE.id, after_id, page_size)
+        except Exception as e:
+            logging.error(f"Erreur de chargement des historiques: {e}")
+            return []
+
+    def iter_histories(self, page_size=DEFAULT_PAGE_SIZE):
+        """Parcourt tout l'historique page par page (mémoire bornée)."""
+        return safe_iter(iter_keyset(db_session.query(HISTORIQUE), HISTORIQUE.id, page_size), "historiques")
+
+    def stream_histories(self, batch_size=DEFAULT_PAGE_SIZE):
+        """Parcourt tout l'historique en une seule requête à curseur serveur."""
+        return safe_iter(stream(db_session.query(HISTORIQUE).order_by(HISTORIQUE.id), batch_size), "historiques")
+
     def get_history(self, history_id):
         """Récupère un événement historique par son ID."""
         try:
-            return my_session.query(HISTORIQUE).filter_by(id=history_id).first()
+            with read_scope() as session:
+                return session.query(HISTORIQUE).populate_existing().filter_by(id=history_id).first()
         except Exception as e:
             logging.error(
                 f"Erreur lors de la récupération de l'historique : {str(e)}")
@@ -36,14 +58,14 @@ class HISTORIQUE_CONTROLLER:
     def update_history(self, history_id, jour_heure=None, event_type=None):
         """Met à jour un événement historique."""
         try:
-            history = my_session.query(
+            history = db_session.query(
                 HISTORIQUE).filter_by(id=history_id).first()
             if history:
-                if jour_heure:
-                    history.jour_heure = jour_heure
-                if event_type:
-                    history.event_type = event_type
-                my_session.commit()
+                with session_scope():
+                    if jour_heure:
+                        history.jour_heure = jour_heure
+                    if event_type:
+                        history.event_type = event_type
                 return history
         except Exception as e:
             logging.error(
@@ -52,26 +74,45 @@ class HISTORIQUE_CONTROLLER:
     def delete_history(self, history_id):
         """Supprime un événement historique."""
         try:
-            history = my_session.query(
+            history = db_session.query(
                 HISTORIQUE).filter_by(id=history_id).first()
             if history:
-                my_session.delete(history)
-                my_session.commit()
+                with session_scope() as session:
+                    session.delete(history)
         except Exception as e:
             logging.error(
                 f"Erreur lors de la suppression de l'historique : {str(e)}")
 
-    def filter_history(self, start_date=None, end_date=None, event_type=None):
-        """Filtre les événements historiques selon les critères fournis."""
+    def filter_history(self, start_date=None, end_date=None, event_type=None, chauffeur_id=None,
+                       after=None, limit=None):
+        """
+        Filtre les événements historiques en SQL, du plus récent au plus ancien.
+        after=(jour_heure, id) du dernier événement déjà lu et limit permettent de lire
+        le résultat page par page (pagination par clé, servie par les index de la table).
+        """
         try:
-            query = my_session.query(HISTORIQUE)
+            query = (db_session.query(HISTORIQUE).populate_existing()
+                     .options(joinedload(HISTORIQUE.chauffeur)))
             if start_date:
                 query = query.filter(HISTORIQUE.jour_heure >= start_date)
             if end_date:
                 query = query.filter(HISTORIQUE.jour_heure <= end_date)
             if event_type:
                 query = query.filter(HISTORIQUE.event_type == event_type)
-            return query.all()
+            if chauffeur_id:
+                query = query.filter(HISTORIQUE.chauffeur_id == chauffeur_id)
+            if after is not None:
+                last_date, last_id = after
+                query = query.filter(or_(
+                    HISTORIQUE.jour_heure < last_date,
+                    and_(HISTORIQUE.jour_heure == last_date, HISTORIQUE.id < last_id),
+                ))
+            query = query.order_by(HISTORIQUE.jour_heure.desc(), HISTORIQUE.id.desc())
+            if limit is not None:
+                query = query.limit(limit)
+            with read_scope():
+                return query.all()
         except Exception as e:
             logging.error(
                 f"Erreur lors du filtrage de l'historique : {str(e)}")
+            return []
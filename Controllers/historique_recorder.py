@@ -0,0 +1,71 @@
+import datetime
+import logging
+import threading
+
+from Controllers.batch_writer import BatchQueueWriter
+from Models.database_model import db_session, remove_session
+from Models.historitique_model import HISTORIQUE
+
+
+class HISTORIQUE_RECORDER(BatchQueueWriter):
+    """
+    Enregistre les événements (reconnaissances, tests d'alcool) dans HISTORIQUE par lots.
+    record() se contente de mettre l'événement en file ; un thread dédié, avec sa propre
+    session, les insère en une seule requête groupée tous les batch_size événements ou
+    toutes les flush_interval secondes. La boucle caméra ne fait donc aucun aller-retour
+    avec la base.
+    """
+
+    EVENT_RECONNAISSANCE = "RECONNAISSANCE"
+    EVENT_TEST_ALCOOL = "TEST_ALCOOL"
+
+    thread_name = "historique-recorder"
+
+    def __init__(self, batch_size=50, flush_interval=5.0):
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval)
+        self._session = None
+
+    def record(self, chauffeur_id, event_type, jour_heure=None, resultat=None, alcool_max=None,
+               alcool_moyen=None, duree_depassement=None):
+        """Met un événement en file (avec le verdict pour un test d'alcool) ; retourne immédiatement."""
+        if chauffeur_id is None:
+            return
+        # Toutes les lignes ont les mêmes clés : le lot reste une seule insertion groupée
+        self.put({
+            "chauffeur_id": chauffeur_id,
+            "event_type": event_type[:50],
+            "jour_heure": jour_heure or datetime.datetime.now(),
+            "resultat": resultat,
+            "alcool_max": alcool_max,
+            "alcool_moyen": alcool_moyen,
+            "duree_depassement": duree_depassement,
+        })
+
+    def open_writer(self):
+        # Session propre au thread d'écriture (db_session est locale à chaque thread)
+        self._session = db_session()
+
+    def close_writer(self):
+        remove_session()
+
+    def write_batch(self, rows):
+        try:
+            self._session.bulk_insert_mappings(HISTORIQUE, rows)
+            self._session.commit()
+        except Exception as e:
+            self._session.rollback()
+            logging.error(f"Erreur lors de l'enregistrement groupé de l'historique ({len(rows)} événements) : {e}")
+
+
+_shared_recorder = None
+_shared_recorder_lock = threading.Lock()
+
+
+def get_history_recorder():
+    """Retourne l'enregistreur partagé par toute l'application, créé au premier appel."""
+    global _shared_recorder
+    if _shared_recorder is None:
+        with _shared_recorder_lock:
+            if _shared_recorder is None:
+                _shared_recorder = HISTORIQUE_RECORDER()
+    return _shared_recorder
@@ -1,6 +1,8 @@
 import logging
+from sqlalchemy.orm import joinedload
 from Models.image_model import IMAGE
-from Models.database_model import my_session
+from Models.database_model import db_session, read_scope, session_scope
+from Controllers.pagination import DEFAULT_PAGE_SIZE, keyset_page, iter_keyset, stream, safe_iter
 
 # Configuration du journal des logs
 logging.basicConfig(level=logging.INFO)
@@ -8,6 +10,29 @@ logging.basicConfig(level=logging.INFO)
 class IMAGE_CONTROLLER:
     """Gestion des opérations CRUD sur les images dans la base de données."""
 
+    # Abonnés notifiés après chaque ajout/modification/suppression validé, quelle que soit
+    # l'instance du contrôleur utilisée : callback(événement, photo ou id)
+    _listeners = []
+
+    @classmethod
+    def add_listener(cls, callback):
+        """Abonne un callback aux événements "added", "updated" (IMAGE) et "deleted" (id de la photo)."""
+        if callback not in cls._listeners:
+            cls._listeners.append(callback)
+
+    @classmethod
+    def remove_listener(cls, callback):
+        if callback in cls._listeners:
+            cls._listeners.remove(callback)
+
+    @classmethod
+    def _notify(cls, event, payload):
+        for callback in list(cls._listeners):
+            try:
+                callback(event, payload)
+            except Exception as e:
+                logging.error(f"Erreur d'un abonné aux images ({event}) : {e}")
+
     @staticmethod
     def validate_input(value, field_name):
         """Valide qu'un champ obligatoire n'est pas vide ou invalide."""
@@ -24,13 +49,13 @@ class IMAGE_CONTROLLER:
 
         try:
             new_photo = IMAGE(url=url.strip(), personne_id=personne_id)
-            my_session.add(new_photo)
-            my_session.commit()
-            my_session.refresh(new_photo)
+            with session_scope() as session:
+                session.add(new_photo)
+            db_session.refresh(new_photo)
             logging.info(f"Photo ajoutée avec succès : {new_photo}")
+            self._notify("added", new_photo)
             return new_photo
         except Exception as e:
-            my_session.rollback()
             logging.error(f"Erreur lors de l'ajout de la photo : {e}")
             return None
 
@@ -41,20 +66,54 @@ class IMAGE_CONTROLLER:
             return None
 
         try:
-            return my_session.query(IMAGE).filter_by(id=photo_id).first()
+            with read_scope() as session:
+                return session.query(IMAGE).populate_existing().filter_by(id=photo_id).first()
         except Exception as e:
             logging.error(f"Erreur lors de la récupération de la photo : {e}")
             return None
 
     # READ - Récupérer toutes les images
-    def get_all_photos(self, limit=100):
-        """Récupère toutes les photos avec une limite."""
+    def get_all_photos(self, limit=None):
+        """Récupère toutes les photos (ou les `limit` premières). Pour les grandes tables, préférer iter_photos()."""
         try:
-            return my_session.query(IMAGE).limit(limit).all()
+            with read_scope() as session:
+                query = session.query(IMAGE).populate_existing().order_by(IMAGE.id)
+                if limit is not None:
+                    query = query.limit(limit)
+                return query.all()
         except Exception as e:
             logging.error(f"Erreur lors de la récupération des photos : {e}")
             return None
 
+    def get_all_photos_with_person(self, limit=None):
+        """Récupère les photos et leur personne en une seule requête (jointure), sans requête par photo."""
+        try:
+            with read_scope() as session:
+                query = (session.query(IMAGE).populate_existing()
+                         .options(joinedload(IMAGE.personne)).order_by(IMAGE.id))
+                if limit is not None:
+                    query = query.limit(limit)
+                return query.all()
+        except Exception as e:
+            logging.error(f"Erreur lors de la récupération des photos : {e}")
+            return None
+
+    def get_photos_page(self, after_id=None, page_size=DEFAULT_PAGE_SIZE):
+        """Page de photos d'id strictement supérieur à after_id (pagination par clé)."""
+        try:
+            return keyset_page(db_session.query(IMAGE), IMAGE.id, after_id, page_size)
+        except Exception as e:
+            logging.error(f"Erreur lors de la récupération des photos : {e}")
+            return []
+
+    def iter_photos(self, page_size=DEFAULT_PAGE_SIZE):
+        """Parcourt toutes les photos page par page ; d'autres requêtes restent possibles pendant le parcours."""
+        return safe_iter(iter_keyset(db_session.query(IMAGE), IMAGE.id, page_size), "photos")
+
+    def stream_photos(self, batch_size=DEFAULT_PAGE_SIZE):
+        """Parcourt toutes les photos en une seule requête à curseur serveur (lecture seule, sans autre requête entre-temps)."""
+        return safe_iter(stream(db_session.query(IMAGE).order_by(IMAGE.id), batch_size), "photos")
+
     # UPDATE - Mettre à jour une image
     def update_photo(self, photo_id, new_url=None, new_personne_id=None):
         """Met à jour une photo existante dans la base de données."""
@@ -62,20 +121,19 @@ class IMAGE_CONTROLLER:
             return None
 
         try:
-            photo = my_session.query(IMAGE).filter_by(id=photo_id).first()
+            photo = db_session.query(IMAGE).filter_by(id=photo_id).first()
             if not photo:
                 logging.info(f"Aucune photo trouvée avec l'ID {photo_id}.")
                 return None
 
-            if new_url:
-                photo.url = new_url.strip()
-            if new_personne_id:
-                photo.personne_id = new_personne_id
-
-            my_session.commit()
+            with session_scope():
+                if new_url:
+                    photo.url = new_url.strip()
+                if new_personne_id:
+                    photo.personne_id = new_personne_id
+            self._notify("updated", photo)
             return photo
         except Exception as e:
-            my_session.rollback()
             logging.error(f"Erreur lors de la mise à jour de la photo : {e}")
             return None
 
@@ -86,15 +144,15 @@ class IMAGE_CONTROLLER:
             return False
 
         try:
-            photo = my_session.query(IMAGE).filter_by(id=photo_id).first()
+            photo = db_session.query(IMAGE).filter_by(id=photo_id).first()
             if not photo:
                 return False
 
-            my_session.delete(photo)
-            my_session.commit()
+            with session_scope() as session:
+                session.delete(photo)
+            self._notify("deleted", photo_id)
             return True
         except Exception as e:
-            my_session.rollback()
             logging.error(f"Erreur lors de la suppression de la photo : {e}")
             return False
 
@@ -105,14 +163,15 @@ class IMAGE_CONTROLLER:
             return False
 
         try:
-            photo = my_session.query(IMAGE).filter_by(url=image_path).first()
+            photo = db_session.query(IMAGE).filter_by(url=image_path).first()
             if not photo:
                 return False
 
-            my_session.delete(photo)
-            my_session.commit()
+            photo_id = photo.id
+            with session_scope() as session:
+                session.delete(photo)
+            self._notify("deleted", photo_id)
             return True
         except Exception as e:
-            my_session.rollback()
             logging.error(f"Erreur lors de la suppression de la photo par chemin : {e}")
             return False
@@ -0,0 +1,106 @@
+import json
+import threading
+import time
+
+import numpy as np
+
+# Une mesure du capteur MQ3 : instant de réception (s, horloge time.time), valeur
+# analogique d'alcool, sortie numérique du module et alerte calculée par l'Arduino
+MQ3_SAMPLE_DTYPE = np.dtype([
+    ("timestamp", np.float64),
+    ("alcohol", np.float32),
+    ("digital", np.int8),
+    ("alert", np.int8),
+])
+
+
+def parse_mq3_line(line, timestamp=None):
+    """
+    Convertit une ligne JSON de l'Arduino ({"alcohol": .., "digital": .., "alert": ..})
+    en tuple (timestamp, alcohol, digital, alert), ou None si la ligne n'est pas une mesure.
+    """
+    try:
+        data = json.loads(line)
+        return (time.time() if timestamp is None else timestamp,
+                float(data["alcohol"]), int(data.get("digital", 0)), int(bool(data.get("alert", 0))))
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+
+class Mq3RingBuffer:
+    """
+    Tampon circulaire de taille fixe des mesures MQ3 (tableau NumPy structuré) : la
+    mémoire est allouée une fois pour toutes, les plus anciennes mesures sont écrasées.
+    Écriture depuis n'importe quel thread ; les lectures retournent des copies.
+    """
+
+    def __init__(self, capacity=86400):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=MQ3_SAMPLE_DTYPE)
+        self._next = 0      # prochaine case à écrire
+        self._count = 0     # nombre de cases valides
+        self.total = 0      # nombre de mesures reçues depuis la création
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def append(self, sample):
+        """Ajoute une mesure (timestamp, alcohol, digital, alert)."""
+        with self._lock:
+            self._data[self._next] = sample
+            self._next = (self._next + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            self.total += 1
+
+    def extend(self, samples):
+        """Ajoute un lot de mesures (tableau MQ3_SAMPLE_DTYPE ou liste de tuples)."""
+        samples = np.asarray(samples, dtype=MQ3_SAMPLE_DTYPE)[-self.capacity:]
+        with self._lock:
+            first = min(len(samples), self.capacity - self._next)
+            self._data[self._next:self._next + first] = samples[:first]
+            self._data[:len(samples) - first] = samples[first:]
+            self._next = (self._next + len(samples)) % self.capacity
+            self._count = min(self._count + len(samples), self.capacity)
+            self.total += len(samples)
+
+    def latest(self, count=None):
+        """Copie des `count` dernières mesures (toutes par défaut), de la plus ancienne à la plus récente."""
+        with self._lock:
+            count = self._count if count is None else min(count, self._count)
+            indices = (self._next - count + np.arange(count)) % self.capacity
+            return self._data[indices]
+
+    def since(self, timestamp):
+        """Copie des mesures reçues à partir de `timestamp`."""
+        samples = self.latest()
+        return samples[np.searchsorted(samples["timestamp"], timestamp):]
+
+    def clear(self):
+        with self._lock:
+            self._next = 0
+            self._count = 0
+
+    def decimated(self, max_points, since=None):
+        """Mesures d'alcool (depuis `since` si fourni) réduites à environ max_points points : voir decimate()."""
+        samples = self.latest() if since is None else self.since(since)
+        return decimate(samples["timestamp"], samples["alcohol"], max_points)
+
+
+def decimate(times, values, max_points):
+    """
+    Réduit une série à environ max_points points pour l'affichage. Chaque tranche garde
+    son minimum et son maximum, dans l'ordre chronologique : les pics restent visibles.
+    """
+    if len(values) <= max_points:
+        return times, values
+    buckets = max(1, max_points // 2)
+    usable = len(values) // buckets * buckets
+    times = times[-usable:].reshape(buckets, -1)
+    values = values[-usable:].reshape(buckets, -1)
+    rows = np.arange(buckets)
+    low, high = values.argmin(axis=1), values.argmax(axis=1)
+    first, second = np.minimum(low, high), np.maximum(low, high)
+    out_times = np.column_stack((times[rows, first], times[rows, second])).ravel()
+    out_values = np.column_stack((values[rows, first], values[rows, second])).ravel()
+    return out_times, out_values
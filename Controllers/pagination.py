@@ -0,0 +1,59 @@
+import logging
+
+from Models.database_model import read_scope
+
+DEFAULT_PAGE_SIZE = 500
+
+
+def keyset_page(query, key_column, after=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Retourne la page suivant la clé `after` (exclue), triée par key_column croissante.
+    Contrairement à OFFSET, le coût d'une page ne dépend pas de sa position dans la table
+    et une ligne insérée ou supprimée entre deux pages ne décale pas les suivantes.
+    Chaque page est lue dans sa propre transaction (read_scope).
+    """
+    if after is not None:
+        query = query.filter(key_column > after)
+    with read_scope():
+        return query.populate_existing().order_by(key_column).limit(page_size).all()
+
+
+def iter_keyset(query, key_column, page_size=DEFAULT_PAGE_SIZE, key=lambda row: row.id):
+    """
+    Parcourt toute la requête page par page (mémoire bornée à une page). Chaque page est
+    entièrement lue avant d'être rendue : l'appelant peut donc faire d'autres requêtes
+    sur la même session pendant le parcours.
+    """
+    after = None
+    while True:
+        page = keyset_page(query, key_column, after, page_size)
+        if not page:
+            return
+        yield from page
+        if len(page) < page_size:
+            return
+        after = key(page[-1])
+
+
+def stream(query, batch_size=DEFAULT_PAGE_SIZE):
+    """
+    Parcourt la requête avec un curseur côté serveur (yield_per) : une seule requête,
+    les lignes arrivent par lots de batch_size. La connexion reste occupée jusqu'à la
+    fin du parcours ; ne pas interroger la même session entre-temps (MySQL l'interdit).
+    La transaction (read_scope) couvre tout le parcours.
+    """
+    with read_scope():
+        yield from query.populate_existing().yield_per(batch_size)
+
+
+def safe_iter(rows, description):
+    """
+    Enveloppe un itérateur de lignes : une erreur de base est journalisée puis relevée.
+    Un parcours interrompu n'est jamais rendu comme complet : FaceDatabase.load(), par
+    exemple, garde alors sa galerie précédente au lieu d'en installer une partielle.
+    """
+    try:
+        yield from rows
+    except Exception as e:
+        logging.error(f"Erreur lors du parcours des {description} : {e}")
+        raise
@@ -0,0 +1,60 @@
+import datetime
+import logging
+import os
+import time
+
+from Controllers.batch_writer import BatchQueueWriter
+
+
+class RecognitionLogController(BatchQueueWriter):
+    """
+    Journal des reconnaissances écrit en arrière-plan.
+    log() ne fait que déposer la ligne dans une file : un thread dédié l'écrit par lots
+    (toutes les flush_interval secondes ou tous les batch_size événements) et fait
+    tourner le fichier au-delà de max_bytes. Un même chauffeur n'est journalisé
+    qu'une fois par fenêtre de debounce_s secondes.
+    """
+
+    thread_name = "recognition-log"
+
+    def __init__(self, path="reconnaissance_log.txt", debounce_s=10.0, flush_interval=1.0,
+                 batch_size=100, max_bytes=5 * 1024 * 1024, backup_count=5):
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval)
+        self.path = path
+        self.debounce_s = debounce_s
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._last_logged = {}  # {identité: instant monotone du dernier enregistrement}
+
+    def log(self, identity, name, score):
+        """Journalise une reconnaissance ; retourne False si elle est ignorée (debounce)."""
+        now = time.monotonic()
+        last = self._last_logged.get(identity)
+        if last is not None and now - last < self.debounce_s:
+            return False
+        self._last_logged[identity] = now
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.put(f"[{timestamp}] {name} - Score : {score:.4f}\n")
+        return True
+
+    def write_batch(self, lines):
+        try:
+            data = "".join(lines)
+            if self.max_bytes and os.path.exists(self.path) and \
+                    os.path.getsize(self.path) + len(data.encode("utf-8")) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(data)
+        except OSError as e:
+            logging.error(f"Erreur d'écriture du journal de reconnaissance : {e}")
+
+    def _rotate(self):
+        """reconnaissance_log.txt -> .1 -> .2 ... ; le plus ancien au-delà de backup_count est supprimé."""
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
@@ -0,0 +1,160 @@
+import struct
+
+import numpy as np
+
+from Controllers.mq3_sample_buffer import MQ3_SAMPLE_DTYPE
+
+
+class LineFramer:
+    """
+    Découpe un flux d'octets série en lignes de texte. Les octets reçus sont accumulés
+    dans un tampon ; chaque "\n" termine une ligne (le "\r" éventuel est retiré). Une
+    ligne plus longue que max_line sans fin de ligne est considérée comme du bruit
+    (débit mal réglé, port partagé) et jetée pour que le tampon reste borné.
+    """
+
+    def __init__(self, max_line=4096, encoding="utf-8"):
+        self.max_line = max_line
+        self.encoding = encoding
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """Ajoute les octets reçus et retourne la liste des lignes complètes (non vides)."""
+        self._buffer += data
+        if b"\n" not in data:
+            if len(self._buffer) > self.max_line:
+                self._buffer.clear()
+            return []
+        *lines, rest = self._buffer.split(b"\n")
+        self._buffer = bytearray(rest if len(rest) <= self.max_line else b"")
+        decoded = (line.decode(self.encoding, errors="replace").strip() for line in lines)
+        return [line for line in decoded if line]
+
+    def reset(self):
+        self._buffer.clear()
+
+
+# Trame binaire MQ3 (petit-boutiste, 7 octets) :
+#   sync (0xA5) | seq (u8) | alcohol (u16) | flags (u8 : bit 0 digital, bit 1 alerte) | crc (u16)
+# Le CRC-16/CCITT-FALSE couvre seq, alcohol et flags. seq s'incrémente à chaque trame
+# (modulo 256) et permet de compter les trames perdues.
+FRAME_SYNC = 0xA5
+FRAME_DTYPE = np.dtype([
+    ("sync", np.uint8),
+    ("seq", np.uint8),
+    ("alcohol", "<u2"),
+    ("flags", np.uint8),
+    ("crc", "<u2"),
+])
+FRAME_SIZE = FRAME_DTYPE.itemsize
+_CRC_SPAN = slice(1, 5)
+
+
+def _crc16_table():
+    table = np.zeros(256, dtype=np.uint16)
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table[byte] = crc & 0xFFFF
+    return table
+
+
+_CRC16_TABLE = _crc16_table()
+
+
+def crc16_ccitt(data):
+    """CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) d'une suite d'octets."""
+    crc = 0xFFFF
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ int(_CRC16_TABLE[(crc >> 8) ^ byte])
+    return crc
+
+
+def crc16_ccitt_rows(rows):
+    """CRC-16/CCITT-FALSE de chaque ligne d'un tableau d'octets (n, m), calculé colonne par colonne."""
+    crc = np.full(len(rows), 0xFFFF, dtype=np.uint16)
+    for column in rows.T:
+        crc = (crc << 8) ^ _CRC16_TABLE[(crc >> 8) ^ column]
+    return crc
+
+
+def encode_frame(seq, alcohol, digital, alert):
+    """Construit une trame binaire (utilisé par le simulateur et les tests ; l'Arduino fait de même en C)."""
+    body = struct.pack("<BHB", seq & 0xFF, int(alcohol) & 0xFFFF, (1 if digital else 0) | (2 if alert else 0))
+    return bytes([FRAME_SYNC]) + body + struct.pack("<H", crc16_ccitt(body))
+
+
+class BinaryFramer:
+    """
+    Décode un flux de trames binaires MQ3 par lots : toutes les trames complètes du
+    tampon sont lues d'un coup avec numpy.frombuffer et leurs CRC vérifiés ensemble.
+    Une trame invalide (octet de synchronisation ou CRC faux) fait avancer d'un octet
+    jusqu'au prochain 0xA5 : le décodeur se resynchronise seul après une corruption.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._last_seq = None
+        self.crc_errors = 0        # trames rejetées
+        self.skipped_bytes = 0     # octets ignorés pour se resynchroniser
+        self.lost_frames = 0       # trames manquantes d'après seq
+
+    def feed(self, data):
+        """Ajoute les octets reçus et retourne les trames valides (tableau FRAME_DTYPE)."""
+        buffer = self._buffer
+        buffer += data
+        decoded = []
+        while len(buffer) >= FRAME_SIZE:
+            start = buffer.find(FRAME_SYNC)
+            if start < 0:
+                self.skipped_bytes += len(buffer)
+                buffer.clear()
+                break
+            if start:
+                self.skipped_bytes += start
+                del buffer[:start]
+            count = len(buffer) // FRAME_SIZE
+            if not count:
+                break
+            raw = np.frombuffer(bytes(buffer[:count * FRAME_SIZE]), dtype=np.uint8).reshape(count, FRAME_SIZE)
+            frames = raw.view(FRAME_DTYPE).ravel()
+            valid = (frames["sync"] == FRAME_SYNC) & (crc16_ccitt_rows(raw[:, _CRC_SPAN]) == frames["crc"])
+            invalid = np.flatnonzero(~valid)
+            good = int(invalid[0]) if len(invalid) else count
+            if good:
+                decoded.append(frames[:good].copy())
+                del buffer[:good * FRAME_SIZE]
+            if good < count:
+                # Trame corrompue : on saute son octet de synchronisation et on cherche le suivant
+                self.crc_errors += 1
+                self.skipped_bytes += 1
+                del buffer[:1]
+        if not decoded:
+            return np.empty(0, dtype=FRAME_DTYPE)
+        frames = np.concatenate(decoded) if len(decoded) > 1 else decoded[0]
+        self._count_lost(frames["seq"])
+        return frames
+
+    def _count_lost(self, seqs):
+        if self._last_seq is not None:
+            seqs_with_previous = np.concatenate(([self._last_seq], seqs))
+        else:
+            seqs_with_previous = seqs
+        gaps = (np.diff(seqs_with_previous.astype(np.int16)) - 1) % 256
+        self.lost_frames += int(gaps.sum())
+        self._last_seq = int(seqs[-1])
+
+    def reset(self):
+        self._buffer.clear()
+        self._last_seq = None
+
+
+def frames_to_samples(frames, timestamp):
+    """Convertit des trames décodées en mesures MQ3 (MQ3_SAMPLE_DTYPE) horodatées à leur réception."""
+    samples = np.empty(len(frames), dtype=MQ3_SAMPLE_DTYPE)
+    samples["timestamp"] = timestamp
+    samples["alcohol"] = frames["alcohol"]
+    samples["digital"] = frames["flags"] & 1
+    samples["alert"] = (frames["flags"] >> 1) & 1
+    return samples
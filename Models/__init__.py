@@ -4,3 +4,4 @@ from.chauffeur_model import CHAUFFEUR
 from.historitique_model import HISTORIQUE
 from.personne_model import PERSONNE
 from.image_model import IMAGE
+from.embedding_model import EMBEDDING_VISAGE
@@ -1,5 +1,7 @@
+from contextlib import contextmanager
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session
 # Définir la classe de base
 Base = declarative_base()
 
@@ -10,9 +12,87 @@ HOST = 'localhost'
 PORT = '3306'
 DB_NAME = 'enregistrement_chauffeurs'
 
+# Pool de connexions : une connexion par thread actif (interface, lecteur Arduino,
+# enregistreurs en arrière-plan), vérifiée avant usage et recyclée avant que MySQL
+# ne la ferme (wait_timeout, 8 h par défaut)
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+POOL_RECYCLE = 3600
+POOL_TIMEOUT = 30
+
 DATABASE_URL = f"mysql+pymysql://{USERNAME}:{PASSWORD}@{HOST}:{PORT}/{DB_NAME}"
-engine = create_engine(DATABASE_URL)
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_recycle=POOL_RECYCLE,
+    pool_timeout=POOL_TIMEOUT,
+    pool_pre_ping=True,
+)
+
+# Fabrique de sessions. Les objets n'expirent pas au commit : lus dans une read_scope,
+# ils restent utilisables après la fin de la transaction sans nouvelle requête
+Session = sessionmaker(bind=engine, expire_on_commit=False)
+
+# Session par thread : db_session() (ou directement db_session.query, .add, .commit...)
+# retourne toujours la session du thread courant
+db_session = scoped_session(Session)
+
+# Compatibilité : l'ancienne session globale est désormais la session du thread courant
+my_session = db_session
+
+
+# Profondeur des unités (session_scope, read_scope) en cours sur une session
+_SCOPE_DEPTH = "scope_depth"
+
+
+@contextmanager
+def session_scope():
+    """
+    Unité de travail sur la session du thread courant : commit à la sortie du bloc,
+    rollback (puis propagation de l'exception) en cas d'erreur.
+    """
+    session = db_session()
+    session.info[_SCOPE_DEPTH] = session.info.get(_SCOPE_DEPTH, 0) + 1
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.info[_SCOPE_DEPTH] -= 1
+
+
+@contextmanager
+def read_scope():
+    """
+    Lecture sur la session du thread courant, dans sa propre transaction : celle restée
+    ouverte avant (chargement différé d'un attribut) est terminée en entrant, celle de la
+    lecture en sortant. En REPEATABLE READ (MySQL), la session d'un thread qui vit
+    longtemps (interface, mise à jour de la galerie) garderait sinon l'instantané de sa
+    première lecture. Imbriquée dans une autre unité, elle s'y joint.
+    Les requêtes utilisent populate_existing() : les objets déjà chargés par la session
+    (ils n'expirent pas au commit) sont remis à jour par la lecture.
+    """
+    session = db_session()
+    outermost = not session.info.get(_SCOPE_DEPTH)
+    if outermost and session.in_transaction():
+        session.commit()
+    session.info[_SCOPE_DEPTH] = session.info.get(_SCOPE_DEPTH, 0) + 1
+    try:
+        yield session
+    except Exception:
+        if outermost:
+            session.rollback()
+        raise
+    else:
+        if outermost:
+            session.commit()
+    finally:
+        session.info[_SCOPE_DEPTH] -= 1
+
 
-# Optionnel : création d'une session
-Session = sessionmaker(bind=engine)
-my_session = Session()
+def remove_session():
+    """Ferme la session du thread courant et rend sa connexion au pool (à appeler en fin de thread)."""
+    db_session.remove()
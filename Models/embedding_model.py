@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, Column, Integer, String, LargeBinary, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from .database_model import Base
+
+class EMBEDDING_VISAGE(Base):
+    """Embedding InsightFace calculé pour une image, réutilisé tant que le fichier n'a pas changé."""
+    __tablename__ = "embeddings_visages"
+    __table_args__ = (UniqueConstraint("image_id", "modele", name="uq_embedding_image_modele"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    image_id = Column(Integer, ForeignKey("images.id", ondelete="CASCADE"), nullable=False)
+    chemin = Column(String(255), nullable=False)
+    # st_mtime_ns : entier exact (un FLOAT MySQL arrondirait st_mtime et fausserait la comparaison)
+    mtime_ns = Column(BigInteger, nullable=False)
+    taille = Column(Integer, nullable=False)
+    modele = Column(String(50), nullable=False)
+    # float32 brut ; NULL signifie qu'aucun visage n'a été détecté dans l'image
+    vecteur = Column(LargeBinary, nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+
+    image = relationship("IMAGE", back_populates="embeddings")
@@ -1,13 +1,24 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index, Float
 from sqlalchemy.orm import relationship
 from .database_model import Base
 
 class HISTORIQUE(Base):
     __tablename__ = "historiques"
+    __table_args__ = (
+        # Filtre par période (et type d'événement), tri du plus récent au plus ancien
+        Index("ix_historiques_jour_heure_event_type", "jour_heure", "event_type"),
+        # Historique d'un chauffeur, trié par date
+        Index("ix_historiques_chauffeur_id_jour_heure", "chauffeur_id", "jour_heure"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     chauffeur_id = Column(Integer, ForeignKey('chauffeurs.id'), nullable=False)
     jour_heure = Column(DateTime, nullable=False)
     event_type = Column(String(50), nullable=False)
+    # Verdict d'un test d'alcool (TEST_ALCOOL), vides pour les autres événements
+    resultat = Column(String(20), nullable=True)
+    alcool_max = Column(Float, nullable=True)
+    alcool_moyen = Column(Float, nullable=True)
+    duree_depassement = Column(Float, nullable=True)  # secondes au-dessus du seuil
    
     chauffeur = relationship("CHAUFFEUR", back_populates="historiques")
@@ -10,4 +10,5 @@ class IMAGE(Base):
 
     personne_id = Column(Integer, ForeignKey('personnes.id'), nullable=False)
     personne = relationship('PERSONNE', back_populates='images')
+    embeddings = relationship('EMBEDDING_VISAGE', back_populates='image', cascade='all, delete-orphan')
 
@@ -0,0 +1,204 @@
+# bulk_encoder.py
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import cv2
+
+from Controllers.embedding_controller import EMBEDDING_CONTROLLER
+from Views.Home.face_engine_manager import ENGINE_PROFILES, DEFAULT_PROFILE
+
+# Moteur propre à chaque processus d'encodage, créé une fois par _init_worker
+_worker_engine = None
+
+
+def _init_worker(profile, intra_op_threads):
+    global _worker_engine
+    from Views.Home.face_engine_manager import FaceEngineManager
+    cv2.setNumThreads(1)
+    _worker_engine = FaceEngineManager.from_profile(profile, intra_op_threads=intra_op_threads)
+
+
+def _encode_in_worker(image):
+    return _worker_engine.encode_face(image)
+
+
+def decode_image(path, max_side=None):
+    """
+    Lit une image (exécuté dans le pool de threads : cv2 libère le GIL). Avec max_side,
+    les très grandes photos sont réduites avant d'être envoyées aux processus. Désactivé
+    par défaut : l'encodage série de FaceDatabase et la reconnaissance en direct
+    travaillent sur l'image entière, et les embeddings en cache doivent leur correspondre.
+    """
+    image = cv2.imread(path)
+    if image is None or not max_side:
+        return image
+    height, width = image.shape[:2]
+    scale = max_side / max(height, width)
+    if scale < 1.0:
+        image = cv2.resize(image, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+    return image
+
+
+class BulkEncoder:
+    """
+    Encodage en masse des photos : décodage dans un pool de threads, détection et
+    reconnaissance dans un pool de processus (chacun avec ses propres sessions ONNX,
+    limitées à threads_per_process threads), écriture des embeddings par lots dans le
+    cache. Le nombre d'images en vol est borné : la mémoire ne dépend pas du nombre
+    de photos à traiter.
+    """
+
+    def __init__(self, profile=DEFAULT_PROFILE, processes=None, threads_per_process=None, decode_threads=4,
+                 max_side=None, write_batch=256, embedding_controller=None, progress_interval=2.0, report=print):
+        cpus = os.cpu_count() or 1
+        self.profile = profile
+        self.model_name = ENGINE_PROFILES[profile]["model_name"]
+        # Par défaut : la moitié des cœurs en processus, les cœurs restants répartis en threads ONNX
+        self.processes = max(1, cpus // 2) if processes is None else processes
+        self.threads_per_process = threads_per_process or max(1, cpus // max(1, self.processes))
+        self.decode_threads = decode_threads
+        self.max_side = max_side
+        self.write_batch = write_batch
+        self.embedding_controller = embedding_controller or EMBEDDING_CONTROLLER()
+        self.progress_interval = progress_interval
+        self.report = report
+        self.stats = {}
+
+    def _new_stats(self, total):
+        return {"total": total, "done": 0, "encoded": 0, "no_face": 0, "unreadable": 0,
+                "missing": 0, "cached": 0, "elapsed_s": 0.0, "images_per_s": 0.0}
+
+    def encode(self, photos, force=False, on_result=None):
+        """
+        Encode les photos (objets ayant id et url) et enregistre les embeddings dans le cache.
+        Sans force, les photos dont l'entrée en cache correspond encore au fichier sont ignorées.
+        on_result(photo, embedding ou None) est appelé pour chaque photo encodée.
+        Retourne les statistiques (aussi disponibles dans self.stats).
+        """
+        photos = list(photos)
+        stats = self.stats = self._new_stats(len(photos))
+        start = time.perf_counter()
+
+        cache = {} if force else self.embedding_controller.get_embeddings_by_model(self.model_name)
+        todo = []
+        for photo in photos:
+            signature = self.embedding_controller.file_signature(photo.url)
+            if signature is None:
+                stats["missing"] += 1
+            elif not force and self.embedding_controller.is_fresh(cache.get(photo.id), photo.url, signature):
+                stats["cached"] += 1
+            else:
+                todo.append((photo, signature))
+                continue
+            stats["done"] += 1
+
+        pending_records = []
+        last_report = time.perf_counter()
+
+        def handle(photo, signature, embedding):
+            nonlocal last_report
+            stats["done"] += 1
+            stats["encoded" if embedding is not None else "no_face"] += 1
+            pending_records.append((photo.id, photo.url, signature, embedding))
+            if on_result is not None:
+                on_result(photo, embedding)
+            if len(pending_records) >= self.write_batch:
+                self._flush(pending_records)
+            now = time.perf_counter()
+            if now - last_report >= self.progress_interval:
+                last_report = now
+                self._report_progress(stats, now - start)
+
+        if todo:
+            self._say(
+                f"Encodage de {len(todo)} photo(s) sur {len(photos)} : {self.processes} processus x "
+                f"{self.threads_per_process} thread(s) ONNX, {self.decode_threads} thread(s) de décodage.")
+            self._run_pipeline(todo, stats, handle)
+        self._flush(pending_records)
+
+        stats["elapsed_s"] = time.perf_counter() - start
+        stats["images_per_s"] = (stats["encoded"] + stats["no_face"]) / stats["elapsed_s"] if stats["elapsed_s"] else 0.0
+        return stats
+
+    def _run_pipeline(self, todo, stats, handle):
+        window = max(4, 4 * max(1, self.processes))
+        items = iter(todo)
+        decoding = deque()
+
+        def refill(decoders):
+            while len(decoding) < window:
+                item = next(items, None)
+                if item is None:
+                    return
+                decoding.append((item, decoders.submit(decode_image, item[0].url, self.max_side)))
+
+        with ThreadPoolExecutor(self.decode_threads, thread_name_prefix="decode") as decoders:
+            if self.processes == 0:
+                # Sans pool de processus (petits lots) : moteur partagé du processus courant
+                from Views.Home.face_engine_manager import get_face_engine
+                engine = get_face_engine(self.profile)
+                refill(decoders)
+                while decoding:
+                    (photo, signature), future = decoding.popleft()
+                    refill(decoders)
+                    image = future.result()
+                    if image is None:
+                        self._unreadable(photo, stats)
+                        continue
+                    handle(photo, signature, engine.encode_face(image))
+                return
+
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(self.processes, mp_context=context, initializer=_init_worker,
+                                     initargs=(self.profile, self.threads_per_process)) as encoders:
+                encoding = {}
+                refill(decoders)
+                while decoding or encoding:
+                    while decoding and len(encoding) < window:
+                        (photo, signature), future = decoding.popleft()
+                        image = future.result()
+                        if image is None:
+                            self._unreadable(photo, stats)
+                            continue
+                        encoding[encoders.submit(_encode_in_worker, image)] = (photo, signature)
+                    refill(decoders)
+                    if not encoding:
+                        continue
+                    done, _ = wait(encoding, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        photo, signature = encoding.pop(future)
+                        try:
+                            embedding = future.result()
+                        except BrokenProcessPool:
+                            raise  # Un processus est mort (mémoire, modèle introuvable) : inutile de continuer
+                        except Exception as e:
+                            logging.error(f"Erreur d'encodage de {photo.url} : {e}")
+                            embedding = None
+                        handle(photo, signature, embedding)
+
+    @staticmethod
+    def _unreadable(photo, stats):
+        print(f"Attention: Impossible de charger l'image depuis {photo.url}. Fichier corrompu ou illisible.")
+        stats["unreadable"] += 1
+        stats["done"] += 1
+
+    def _flush(self, records):
+        if records:
+            self.embedding_controller.save_embeddings(records, self.model_name)
+            records.clear()
+
+    def _say(self, message):
+        if self.report is not None:
+            self.report(message)
+
+    def _report_progress(self, stats, elapsed):
+        processed = stats["encoded"] + stats["no_face"]
+        rate = processed / elapsed if elapsed else 0.0
+        remaining = stats["total"] - stats["done"]
+        eta = remaining / rate if rate else float("inf")
+        self._say(f"{stats['done']}/{stats['total']} photos ({rate:.1f} img/s, reste ~{eta:.0f} s)")
@@ -1,42 +1,370 @@
 # face_database.py
+import logging
+import threading
+from collections import namedtuple
+
 import cv2
+import numpy as np
+
+from Controllers.batch_writer import BatchQueueWriter
+from Controllers.embedding_controller import EMBEDDING_CONTROLLER
+from Models.database_model import read_scope, remove_session
+from Views.Home.bulk_encoder import BulkEncoder
+from Views.Home.face_engine_manager import get_face_engine, ENGINE_PROFILES, DEFAULT_PROFILE
+from Views.Home.face_index import create_index, normalize_rows
+
+# Copie des champs utiles d'une IMAGE, transmissible d'un thread à l'autre sans session
+PhotoRef = namedtuple("PhotoRef", "id url personne_id")
+
+
+class FaceDatabaseUpdater(BatchQueueWriter):
+    """
+    Applique les changements de photos à la galerie depuis un thread dédié : l'encodage
+    des nouvelles photos, comme le chargement complet (request_reload), ne bloque ni
+    l'interface ni la boucle vidéo. Les événements arrivés ensemble sont traités en un
+    lot (un seul aller-retour au cache d'embeddings).
+    """
+
+    thread_name = "face-database-updater"
+
+    def __init__(self, face_database, batch_size=32, flush_interval=0.2):
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval)
+        self.face_database = face_database
+
+    def close_writer(self):
+        remove_session()
+
+    def write_batch(self, events):
+        # Un lot = une transaction de lecture : la session de ce thread, qui vit aussi
+        # longtemps que l'application, repart à chaque lot d'un instantané à jour
+        # (chauffeurs enrôlés ou modifiés depuis) et ne le garde pas ouvert ensuite
+        try:
+            with read_scope():
+                self.face_database.apply_changes(events)
+        except Exception as e:
+            logging.error(f"Erreur lors de la mise à jour de la galerie de visages : {e}")
 
 
 class FaceDatabase:
-    def __init__(self, person_controller, image_controller, face_engine, threshold=0.65):
-        self.db = []
+    """
+    Galerie des visages enrôlés, agrégée par chauffeur (personne_id) : toutes ses photos
+    sont résumées par un centroïde normalisé, plus éventuellement quelques embeddings
+    représentatifs. Le coût d'une recherche dépend donc du nombre de chauffeurs et non
+    du nombre de photos. L'index est interchangeable (exact, IVF, HNSW : voir face_index.py).
+    """
+
+    def __init__(self, person_controller, image_controller, face_engine=None, threshold=0.65,
+                 engine_profile=DEFAULT_PROFILE, index_kind="auto", embedding_controller=None,
+                 representatives=2, bulk_threshold=64):
+        self.db = {}  # {personne_id: {"nom", "id", "fonction"}}
+        self.photos = {}  # {image_id: (personne_id, embedding normalisé)}
+        self.photos_by_person = {}  # {personne_id: {image_id, ...}}
+        # Entrées par chauffeur dans l'index : le centroïde + jusqu'à `representatives` photos
+        self.representatives = representatives
+        # Nombre de photos à encoder à partir duquel load() utilise le pool de processus
+        self.bulk_threshold = bulk_threshold
         self.controller = person_controller
         self.image_controller = image_controller
-        self.face_engine = face_engine
+        self.embedding_controller = embedding_controller or EMBEDDING_CONTROLLER()
+        self._face_engine = face_engine
+        self.engine_profile = engine_profile
+        self.model_name = face_engine.model_name if face_engine else ENGINE_PROFILES[engine_profile]["model_name"]
         self.threshold = threshold
+        self.index_kind = index_kind
+        self.index = create_index(index_kind)
+        # Protège l'index : la recherche tourne dans le thread de reconnaissance,
+        # les ajouts/suppressions dans le thread de mise à jour
+        self._lock = threading.RLock()
+        self.updater = FaceDatabaseUpdater(self)
+
+    @property
+    def face_engine(self):
+        # Le moteur partagé n'est construit que si une image doit réellement être encodée
+        return self._face_engine or get_face_engine(self.engine_profile)
+
+    def __len__(self):
+        return len(self.db)
+
+    @staticmethod
+    def _profile(person):
+        return {
+            "nom": f"{person.nom} {person.prenom} | Tel: {person.telephone} | Email: {person.email} | Permis: {person.numero_permis} | Sexe: {person.sex}",
+            "fonction": getattr(person, "fonction", None),
+            # Utilise getattr pour une gestion sécurisée des attributs
+            "id": getattr(person, "id", None),
+        }
 
     def load(self):
-        self.db.clear()
-        try:
-            all_photos = self.image_controller.get_all_photos()
-            persons = self.controller.get_driver_by_id(all_photos.personne_id)
-        except Exception as e:
-            print("Erreur de chargement :", e)
+        """
+        (Re)charge toute la galerie. Les embeddings déjà calculés pour ce modèle sont lus
+        depuis le cache ; seules les images nouvelles ou modifiées (chemin, date de
+        modification ou taille différents) sont ré-encodées. Retourne le nombre de profils.
+        Une erreur de base est relevée : la galerie précédente reste alors en place.
+        """
+        # Parcours par pages : toutes les photos sont prises en compte, en mémoire bornée
+        images = self.image_controller.iter_photos()
+
+        cache = self.embedding_controller.get_embeddings_by_model(self.model_name, raise_errors=True)
+        profiles, photos, photos_by_person = {}, {}, {}
+        people, stale = {}, []
+
+        def keep(image_obj, embedding):
+            profiles[image_obj.personne_id] = people[image_obj.personne_id]
+            photos[image_obj.id] = (image_obj.personne_id, normalize_rows(embedding)[0])
+            photos_by_person.setdefault(image_obj.personne_id, set()).add(image_obj.id)
+
+        for image_obj in images:
+            if image_obj.personne_id not in people:
+                driver = self.controller.get_driver_by_id(image_obj.personne_id, raise_errors=True)
+                people[image_obj.personne_id] = self._profile(driver) if driver is not None else None
+            if people[image_obj.personne_id] is None:
+                print(f"Attention: Chauffeur avec ID {image_obj.personne_id} non trouvé pour l'image {image_obj.url}. Ignoré.")
+                continue
+            entry = cache.get(image_obj.id)
+            signature = self.embedding_controller.file_signature(image_obj.url)
+            if self.embedding_controller.is_fresh(entry, image_obj.url, signature):
+                embedding = self.embedding_controller.to_vector(entry)
+                if embedding is not None:
+                    keep(image_obj, embedding)
+            else:
+                stale.append(image_obj)
+
+        for image_obj, embedding in self._encode_all(stale):
+            keep(image_obj, embedding)
+
+        keys, vectors = [], []
+        for personne_id, image_ids in photos_by_person.items():
+            person_keys, person_vectors = self._aggregate(personne_id, [photos[i][1] for i in sorted(image_ids)])
+            keys.extend(person_keys)
+            vectors.extend(person_vectors)
+        index = create_index(self.index_kind, expected_size=len(keys))
+        if keys:
+            index.add(keys, vectors)
+            index.rebuild()
+        with self._lock:
+            self.db = profiles
+            self.photos = photos
+            self.photos_by_person = photos_by_person
+            self.index = index
+        print(f"{len(stale)} image(s) encodée(s) par {self.model_name}, les autres lues depuis le cache.")
+        print(f"Base de données de visages chargée : {len(photos)} photos, {len(profiles)} chauffeurs "
+              f"({len(keys)} entrées, {type(index).__name__}).")
+        return len(profiles)
+
+    def request_reload(self, on_done=None):
+        """
+        Demande le (re)chargement de la galerie au thread de mise à jour : l'encodage des
+        photos (pool de processus au-delà de bulk_threshold) ne gèle pas l'interface, et
+        la galerie précédente reste utilisée jusqu'à la fin. on_done(erreur ou None) est
+        appelé depuis ce thread (passer l'emit d'un signal Qt pour revenir à l'interface).
+        """
+        self.updater.put(("reload", on_done))
+
+    def _encode_all(self, image_objs):
+        """
+        Encode les photos absentes du cache ou modifiées et met le cache à jour ; retourne
+        les couples (image, embedding) des photos où un visage a été trouvé. Au-delà de
+        bulk_threshold photos, l'encodage passe par le BulkEncoder (pool de processus).
+        """
+        if not image_objs:
+            return []
+        if self._face_engine is None and self.bulk_threshold and len(image_objs) >= self.bulk_threshold:
+            results = []
+
+            def collect(image_obj, embedding):
+                if embedding is not None:
+                    results.append((image_obj, embedding))
+
+            encoder = BulkEncoder(profile=self.engine_profile, embedding_controller=self.embedding_controller)
+            encoder.encode(image_objs, force=True, on_result=collect)
+            return results
+
+        results, to_save = [], []
+        for image_obj in image_objs:
+            embedding, record = self._embedding_for(image_obj, None)
+            if record is not None:
+                to_save.append(record)
+            if embedding is not None:
+                results.append((image_obj, embedding))
+        self.embedding_controller.save_embeddings(to_save, self.model_name)
+        return results
+
+    def _keys(self, personne_id):
+        """Clés d'index réservées à un chauffeur : centroïde puis représentants."""
+        stride = self.representatives + 1
+        return [personne_id * stride + slot for slot in range(stride)]
+
+    def _aggregate(self, personne_id, vectors):
+        """
+        Résume les photos d'un chauffeur : centroïde normalisé, puis les photos les plus
+        éloignées de ce qui est déjà retenu (échantillonnage du point le plus lointain),
+        pour couvrir les variations (lunettes, éclairage, profil) que la moyenne lisse.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        centroid = normalize_rows(vectors.mean(axis=0))[0]
+        selected = [centroid]
+        if self.representatives and len(vectors) > 1:
+            closest = vectors @ centroid
+            for _ in range(min(self.representatives, len(vectors))):
+                candidate = int(np.argmin(closest))
+                if closest[candidate] > 0.999:
+                    break  # Toutes les photos restantes sont déjà couvertes
+                selected.append(vectors[candidate])
+                closest = np.maximum(closest, vectors @ vectors[candidate])
+        return self._keys(personne_id)[:len(selected)], selected
+
+    def _refresh_person(self, personne_id):
+        """Recalcule les entrées d'index d'un chauffeur après l'ajout ou le retrait d'une photo."""
+        image_ids = self.photos_by_person.get(personne_id)
+        self.index.remove(self._keys(personne_id))
+        if not image_ids:
+            self.photos_by_person.pop(personne_id, None)
+            self.db.pop(personne_id, None)
             return
+        keys, vectors = self._aggregate(personne_id, [self.photos[i][1] for i in sorted(image_ids)])
+        self.index.add(keys, vectors)
 
-        for chauf in persons:
+    def _embedding_for(self, image_obj, entry):
+        """
+        Retourne (embedding ou None, enregistrement à mettre en cache ou None).
+        Le premier visage détecté sert de référence pour la photo.
+        """
+        img_path = image_obj.url
+        signature = self.embedding_controller.file_signature(img_path)
+        if signature is None:
+            print(f"Attention: Le fichier image n'existe pas : {img_path}. Ignoré.")
+            return None, None
+
+        if self.embedding_controller.is_fresh(entry, img_path, signature):
+            # None si aucun visage lors du dernier encodage et fichier inchangé
+            return self.embedding_controller.to_vector(entry), None
+
+        img = cv2.imread(img_path)
+        if img is None:
+            print(f"Attention: Impossible de charger l'image depuis {img_path}. Fichier corrompu ou illisible.")
+            return None, None
+        embedding = self.face_engine.encode_face(img)
+        if embedding is None:
+            print(f"Attention: Aucun visage détecté dans l'image {img_path}. Ignoré.")
+        return embedding, (image_obj.id, img_path, signature, embedding)
+
+    def add_image(self, image_obj):
+        """Encode (ou lit depuis le cache) une photo et l'ajoute à l'index sans recharger la galerie."""
+        return self.add_images([image_obj]) == 1
+
+    def add_images(self, image_objs):
+        """
+        Ajoute ou remplace plusieurs photos. Le cache est lu et écrit une seule fois pour
+        tout le lot, et l'encodage se fait hors du verrou : la recherche n'est bloquée que
+        le temps de mettre l'index à jour. Retourne le nombre de photos ajoutées.
+        """
+        image_objs = list(image_objs)
+        if not image_objs:
+            return 0
+        cache = self.embedding_controller.get_embeddings_for_images(
+            [image_obj.id for image_obj in image_objs], self.model_name)
+        profiles, prepared, to_save = {}, [], []
+        for image_obj in image_objs:
+            if image_obj.personne_id not in profiles:
+                person = self.controller.get_driver_by_id(image_obj.personne_id)
+                profiles[image_obj.personne_id] = self._profile(person) if person is not None else None
+            embedding, record = self._embedding_for(image_obj, cache.get(image_obj.id))
+            if record is not None:
+                to_save.append(record)
+            prepared.append((image_obj, embedding))
+        self.embedding_controller.save_embeddings(to_save, self.model_name)
+
+        added = 0
+        with self._lock:
+            touched = set()
+            for image_obj, embedding in prepared:
+                old = self.photos.pop(image_obj.id, None)
+                if old is not None:
+                    # Photo modifiée (éventuellement réattribuée) : on la retire de son ancien chauffeur
+                    self.photos_by_person.get(old[0], set()).discard(image_obj.id)
+                    touched.add(old[0])
+                profile = profiles[image_obj.personne_id]
+                if embedding is None or profile is None:
+                    continue
+                self.photos[image_obj.id] = (image_obj.personne_id, normalize_rows(embedding)[0])
+                self.photos_by_person.setdefault(image_obj.personne_id, set()).add(image_obj.id)
+                self.db[image_obj.personne_id] = profile
+                touched.add(image_obj.personne_id)
+                added += 1
+            for personne_id in touched:
+                self._refresh_person(personne_id)
+        return added
+
+    def remove_image(self, image_id):
+        """Retire une photo et met à jour le profil agrégé de son chauffeur."""
+        with self._lock:
+            photo = self.photos.pop(image_id, None)
+            if photo is None:
+                return
+            personne_id = photo[0]
+            self.photos_by_person.get(personne_id, set()).discard(image_id)
+            self._refresh_person(personne_id)
+
+    def apply_changes(self, events):
+        """
+        Applique une suite d'événements (événement, PhotoRef ou id). Seul le dernier
+        événement de chaque photo compte : une photo ajoutée puis supprimée n'est pas encodée.
+        Un rechargement ("reload", on_done) couvre les changements arrivés avant lui.
+        """
+        reloads = [index for index, (event, _) in enumerate(events) if event == "reload"]
+        if reloads:
+            error = None
             try:
-                photo = self.image_controller.get_photo(chauf.personne_id)
-                if photo:
-                    img = cv2.imread(photo.chemin)
-                    emb = self.face_engine.encode_face(img)
-                    if emb is not None:
-                        self.db.append({
-                            "nom": f"{chauf.nom} {chauf.prenom}",
-                            "embedding": emb
-                        })
+                self.load()
             except Exception as e:
-                print(f"Erreur encodage {chauf.nom}: {e}")
+                logging.error(f"Erreur de chargement des visages : {e}")
+                error = e
+            for index in reloads:
+                on_done = events[index][1]
+                if on_done is not None:
+                    on_done(error)
+            events = events[reloads[-1] + 1:]
+        latest = {}
+        for event, payload in events:
+            image_id = payload if event == "deleted" else payload.id
+            latest.pop(image_id, None)
+            latest[image_id] = (event, payload)
+        to_add = [payload for event, payload in latest.values() if event in ("added", "updated")]
+        for image_id, (event, _) in latest.items():
+            if event == "deleted":
+                self.remove_image(image_id)
+        added = self.add_images(to_add)
+        if latest:
+            print(f"Galerie de visages mise à jour : {added} photo(s) encodée(s) ou remplacée(s), "
+                  f"{len(latest) - len(to_add)} retirée(s) ; {len(self.db)} chauffeurs.")
+
+    def on_image_event(self, event, photo):
+        """
+        Abonné aux événements de IMAGE_CONTROLLER : "added", "updated" (IMAGE) ou "deleted" (id).
+        Le changement est seulement mis en file ; FaceDatabaseUpdater l'applique en arrière-plan.
+        """
+        if event in ("added", "updated"):
+            self.updater.put((event, PhotoRef(photo.id, photo.url, photo.personne_id)))
+        elif event == "deleted":
+            self.updater.put((event, photo))
+
+    def identify_batch(self, embeddings):
+        """Identifie plusieurs visages en une seule recherche ; une entrée {"name", "score", "id"} par visage."""
+        if len(embeddings) == 0:
+            return []
+        queries = normalize_rows(embeddings)
+        stride = self.representatives + 1
+        with self._lock:
+            keys, scores = self.index.search(queries, k=1)
+            profiles = [self.db.get(int(key) // stride) if key >= 0 else None for key in keys[:, 0]]
+        matches = []
+        for profile, score in zip(profiles, scores[:, 0]):
+            score = float(score)
+            if profile is not None and score > self.threshold:
+                matches.append({"name": profile["nom"], "score": score, "id": profile["id"]})
+            else:
+                matches.append({"name": "Inconnu", "score": max(score, 0.0), "id": None})
+        return matches
 
     def identify(self, embedding):
-        best_match = {"name": "Inconnu", "score": 0.0}
-        for profile in self.db:
-            score = self.face_engine.compute_similarity(embedding, profile["embedding"])
-            if score > self.threshold and score > best_match["score"]:
-                best_match = {"name": profile["nom"], "score": score}
-        return best_match
+        return self.identify_batch([embedding])[0]
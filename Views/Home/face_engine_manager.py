@@ -1,20 +1,97 @@
 # face_engine_manager.py
+import threading
+
 import numpy as np
-import cv2
 from insightface.app import FaceAnalysis
+from insightface.app.common import Face
+
+# Profils de moteur disponibles. Seuls bbox et embedding sont utilisés par l'application :
+# les modèles landmark 2d/3d et genderage du pack ne sont donc chargés que par le profil "complet".
+ENGINE_PROFILES = {
+    "complet": {"model_name": "buffalo_l", "allowed_modules": None, "det_size": (640, 640)},
+    "standard": {"model_name": "buffalo_l", "allowed_modules": ["detection", "recognition"], "det_size": (640, 640)},
+    "rapide": {"model_name": "buffalo_l", "allowed_modules": ["detection", "recognition"], "det_size": (320, 320)},
+    "leger": {"model_name": "buffalo_s", "allowed_modules": ["detection", "recognition"], "det_size": (320, 320)},
+}
+DEFAULT_PROFILE = "standard"
+
+# Instances partagées par tout le processus (une par profil), créées au premier appel
+_shared_engines = {}
+_shared_engines_lock = threading.Lock()
 
 
 class FaceEngineManager:
-    def __init__(self, model_name='buffalo_l'):
-        self.engine = FaceAnalysis(name=model_name, providers=['CPUExecutionProvider'])
-        self.engine.prepare(ctx_id=0)
+    def __init__(self, model_name='buffalo_l', allowed_modules=("detection", "recognition"),
+                 det_size=(640, 640), providers=("CPUExecutionProvider",), intra_op_threads=None):
+        self.model_name = model_name
+        self.allowed_modules = list(allowed_modules) if allowed_modules else None
+        self.det_size = tuple(det_size)
+        self.engine = FaceAnalysis(name=model_name, allowed_modules=self.allowed_modules,
+                                   providers=list(providers))
+        if intra_op_threads:
+            self._limit_threads(intra_op_threads, list(providers))
+        self.engine.prepare(ctx_id=0, det_size=self.det_size)
+
+    def _limit_threads(self, intra_op_threads, providers):
+        """
+        Recrée les sessions ONNX avec un nombre de threads fixé. FaceAnalysis ne transmet
+        pas de SessionOptions : par défaut chaque session prend tous les cœurs, ce qui
+        écroule le débit quand plusieurs processus d'encodage tournent en parallèle.
+        """
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+        for model in self.engine.models.values():
+            model_file = getattr(model, "model_file", None)
+            if model_file and getattr(model, "session", None) is not None:
+                model.session = onnxruntime.InferenceSession(model_file, sess_options=options,
+                                                             providers=providers)
+
+    @classmethod
+    def from_profile(cls, profile=DEFAULT_PROFILE, **overrides):
+        """Construit le moteur à partir d'un profil de ENGINE_PROFILES (paramètres surchargeables)."""
+        if profile not in ENGINE_PROFILES:
+            raise ValueError(f"Profil de moteur inconnu : {profile}")
+        return cls(**{**ENGINE_PROFILES[profile], **overrides})
 
     def detect_faces(self, frame_rgb):
         return self.engine.get(frame_rgb)
 
+    def detect(self, frame_rgb):
+        """Détection seule (cadres, points clés) ; detect() puis embed() équivaut à detect_faces()."""
+        bboxes, kpss = self.engine.det_model.detect(frame_rgb, max_num=0, metric="default")
+        return [Face(bbox=bboxes[i, 0:4], kps=None if kpss is None else kpss[i], det_score=bboxes[i, 4])
+                for i in range(bboxes.shape[0])]
+
+    def embed(self, frame_rgb, faces):
+        """Complète les visages détectés (embedding...) avec les autres modèles chargés."""
+        for face in faces:
+            for task_name, model in self.engine.models.items():
+                if task_name != "detection":
+                    model.get(frame_rgb, face)
+        return faces
+
     def encode_face(self, image):
         faces = self.engine.get(image)
         return faces[0].embedding if faces else None
 
     def compute_similarity(self, emb1, emb2):
         return np.dot(emb1, emb2) / (np.linalg.norm(emb1) * np.linalg.norm(emb2))
+
+
+def get_face_engine(profile=DEFAULT_PROFILE):
+    """
+    Retourne le moteur partagé du profil demandé, en le construisant au premier appel.
+    Les sessions ONNX étant coûteuses (mémoire et temps de préparation), toutes les vues
+    et l'enrôlement doivent passer par ici plutôt que d'instancier FaceEngineManager.
+    """
+    engine = _shared_engines.get(profile)
+    if engine is None:
+        with _shared_engines_lock:
+            engine = _shared_engines.get(profile)
+            if engine is None:
+                engine = FaceEngineManager.from_profile(profile)
+                _shared_engines[profile] = engine
+    return engine
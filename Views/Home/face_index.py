@@ -0,0 +1,284 @@
+# face_index.py
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:  # dépendance optionnelle
+    hnswlib = None
+
+
+def normalize_rows(vectors):
+    """Retourne les vecteurs en float32 normalisés (norme L2 = 1) ligne par ligne."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[np.newaxis, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores, k):
+    """Indices des k meilleurs scores de chaque ligne, triés par score décroissant."""
+    k = min(k, scores.shape[1])
+    if k == 1:
+        return np.argmax(scores, axis=1)[:, np.newaxis]
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+
+class FaceIndex:
+    """
+    Interface commune des index d'embeddings. Les vecteurs sont supposés normalisés :
+    le score retourné est la similarité cosinus. search() retourne deux tableaux (n, k),
+    les identifiants (-1 si aucun) et les scores (-inf si aucun).
+    """
+
+    def __init__(self, dim=512):
+        self.dim = dim
+
+    def add(self, ids, vectors):
+        raise NotImplementedError
+
+    def remove(self, ids):
+        raise NotImplementedError
+
+    def search(self, queries, k=1):
+        raise NotImplementedError
+
+    def rebuild(self):
+        """Réorganise l'index après un chargement massif (sans effet pour la recherche exacte)."""
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def _empty_result(self, n, k):
+        return np.full((n, k), -1, dtype=np.int64), np.full((n, k), -np.inf, dtype=np.float32)
+
+
+class BruteForceIndex(FaceIndex):
+    """Recherche exacte : une matrice contiguë et un produit matriciel par lot de requêtes."""
+
+    def __init__(self, dim=512, capacity=1024):
+        super().__init__(dim)
+        self._vectors = np.empty((capacity, dim), dtype=np.float32)
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._rows = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def ids(self):
+        return self._ids[:self._size].copy()
+
+    def vectors(self):
+        return self._vectors[:self._size]
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        if needed <= len(self._ids):
+            return
+        capacity = max(needed, 2 * len(self._ids))
+        vectors = np.empty((capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        ids = np.empty(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        self._vectors, self._ids = vectors, ids
+
+    def add(self, ids, vectors):
+        ids = np.asarray(ids, dtype=np.int64).ravel()
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim)
+        self.remove([i for i in ids if int(i) in self._rows])
+        self._reserve(len(ids))
+        start, end = self._size, self._size + len(ids)
+        self._vectors[start:end] = vectors
+        self._ids[start:end] = ids
+        for row, face_id in enumerate(ids, start):
+            self._rows[int(face_id)] = row
+        self._size = end
+
+    def remove(self, ids):
+        for face_id in ids:
+            row = self._rows.pop(int(face_id), None)
+            if row is None:
+                continue
+            last = self._size - 1
+            if row != last:
+                # La dernière ligne prend la place de la ligne supprimée
+                self._vectors[row] = self._vectors[last]
+                self._ids[row] = self._ids[last]
+                self._rows[int(self._ids[row])] = row
+            self._size = last
+
+    def search(self, queries, k=1):
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        if self._size == 0 or len(queries) == 0:
+            return self._empty_result(len(queries), k)
+        scores = queries @ self._vectors[:self._size].T
+        best = _top_k(scores, k)
+        ids, best_scores = self._empty_result(len(queries), k)
+        ids[:, :best.shape[1]] = self._ids[best]
+        best_scores[:, :best.shape[1]] = np.take_along_axis(scores, best, axis=1)
+        return ids, best_scores
+
+
+class IVFIndex(FaceIndex):
+    """
+    Index approché à listes inversées (IVF), en NumPy pur. Les vecteurs sont répartis
+    entre nlist centroïdes (k-means sphérique) ; une requête n'est comparée qu'aux
+    vecteurs des nprobe listes les plus proches, avec un score exact.
+    Tant que l'index contient moins de min_train_size vecteurs, il se comporte
+    comme une recherche exacte.
+    """
+
+    def __init__(self, dim=512, nlist=None, nprobe=16, min_train_size=2048, train_iterations=10, seed=0):
+        super().__init__(dim)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.train_iterations = train_iterations
+        self._rng = np.random.default_rng(seed)
+        self._centroids = None
+        self._lists = [BruteForceIndex(dim)]
+        self._list_of = {}
+
+    def __len__(self):
+        return len(self._list_of)
+
+    @property
+    def is_trained(self):
+        return self._centroids is not None
+
+    def add(self, ids, vectors):
+        ids = np.asarray(ids, dtype=np.int64).ravel()
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim)
+        self.remove([i for i in ids if int(i) in self._list_of])
+        assignments = (np.argmax(vectors @ self._centroids.T, axis=1) if self.is_trained
+                       else np.zeros(len(ids), dtype=np.int64))
+        for list_no in np.unique(assignments):
+            mask = assignments == list_no
+            self._lists[list_no].add(ids[mask], vectors[mask])
+            for face_id in ids[mask]:
+                self._list_of[int(face_id)] = int(list_no)
+
+    def remove(self, ids):
+        for face_id in ids:
+            list_no = self._list_of.pop(int(face_id), None)
+            if list_no is not None:
+                self._lists[list_no].remove([face_id])
+
+    def rebuild(self):
+        """(Ré)entraîne les centroïdes sur le contenu actuel et redistribue tous les vecteurs."""
+        total = len(self)
+        if total < self.min_train_size:
+            return
+        ids = np.concatenate([lst.ids() for lst in self._lists])
+        vectors = np.concatenate([lst.vectors() for lst in self._lists])
+        nlist = min(total, self.nlist or max(1, int(4 * np.sqrt(total))))
+        self._centroids = self._kmeans(vectors, nlist)
+        self._lists = [BruteForceIndex(self.dim, capacity=max(16, 2 * total // nlist))
+                       for _ in range(len(self._centroids))]
+        self._list_of = {}
+        self.add(ids, vectors)
+
+    def _kmeans(self, vectors, nlist):
+        sample_size = min(len(vectors), nlist * 64)
+        sample = vectors[self._rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[self._rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(self.train_iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            counts = np.bincount(assignments, minlength=nlist)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            empty = counts == 0
+            sums = np.zeros_like(centroids)
+            sums[~empty] = np.add.reduceat(sample[np.argsort(assignments, kind="stable")],
+                                           starts[~empty], axis=0)
+            # Les centroïdes vides sont réinitialisés sur des points tirés au hasard
+            sums[empty] = sample[self._rng.choice(sample_size, int(empty.sum()))]
+            centroids = normalize_rows(sums)
+        return centroids
+
+    def search(self, queries, k=1):
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        if not self.is_trained:
+            return self._lists[0].search(queries, k)
+        ids, scores = self._empty_result(len(queries), k)
+        nprobe = min(self.nprobe, len(self._centroids))
+        probes = _top_k(queries @ self._centroids.T, nprobe)
+        for q, query in enumerate(queries):
+            candidate_ids, candidate_scores = [], []
+            for list_no in probes[q]:
+                list_ids, list_scores = self._lists[list_no].search(query, k)
+                candidate_ids.append(list_ids[0])
+                candidate_scores.append(list_scores[0])
+            candidate_ids = np.concatenate(candidate_ids)
+            candidate_scores = np.concatenate(candidate_scores)
+            best = np.argsort(-candidate_scores)[:k]
+            ids[q, :len(best)] = candidate_ids[best]
+            scores[q, :len(best)] = candidate_scores[best]
+        return ids, scores
+
+
+class HNSWIndex(FaceIndex):
+    """
+    Index approché HNSW (graphe), disponible si le paquet optionnel hnswlib est installé.
+    Une suppression marque l'élément ; le ré-ajouter avec le même identifiant le réactive.
+    """
+
+    def __init__(self, dim=512, capacity=1024, M=16, ef_construction=200, ef=64):
+        super().__init__(dim)
+        if hnswlib is None:
+            raise ImportError("hnswlib n'est pas installé.")
+        self._index = hnswlib.Index(space="ip", dim=dim)
+        self._index.init_index(max_elements=capacity, M=M, ef_construction=ef_construction)
+        self._index.set_ef(ef)
+        self._ids = set()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, ids, vectors):
+        ids = np.asarray(ids, dtype=np.int64).ravel()
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim)
+        needed = self._index.get_current_count() + len(ids)
+        if needed > self._index.get_max_elements():
+            self._index.resize_index(max(needed, 2 * self._index.get_max_elements()))
+        # Un identifiant existant (même supprimé) est mis à jour en place
+        self._index.add_items(vectors, ids)
+        self._ids.update(int(i) for i in ids)
+
+    def remove(self, ids):
+        for face_id in ids:
+            if int(face_id) in self._ids:
+                self._index.mark_deleted(int(face_id))
+                self._ids.discard(int(face_id))
+
+    def search(self, queries, k=1):
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        if not self._ids or len(queries) == 0:
+            return self._empty_result(len(queries), k)
+        found_k = min(k, len(self._ids))
+        labels, distances = self._index.knn_query(queries, k=found_k)
+        ids, scores = self._empty_result(len(queries), k)
+        ids[:, :found_k] = labels
+        scores[:, :found_k] = 1.0 - distances
+        return ids, scores
+
+
+INDEX_BACKENDS = {"exact": BruteForceIndex, "ivf": IVFIndex, "hnsw": HNSWIndex}
+
+
+def create_index(kind="auto", dim=512, expected_size=0, **options):
+    """
+    Crée un index. "auto" choisit la recherche exacte pour les petites galeries et,
+    au-delà de 20 000 visages, HNSW si hnswlib est installé, sinon IVF.
+    """
+    if kind == "auto":
+        if expected_size < 20000:
+            kind = "exact"
+        else:
+            kind = "hnsw" if hnswlib is not None else "ivf"
+    if kind not in INDEX_BACKENDS:
+        raise ValueError(f"Type d'index inconnu : {kind}")
+    return INDEX_BACKENDS[kind](dim=dim, **options)
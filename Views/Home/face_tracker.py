@@ -0,0 +1,81 @@
+# face_tracker.py
+import cv2
+
+from Views.Home.pipeline_profiler import PipelineProfiler
+
+
+def create_cv_tracker():
+    """Crée un tracker OpenCV léger (KCF si disponible, sinon MIL)."""
+    for name in ("TrackerKCF_create", "TrackerMIL_create"):
+        for module in (cv2, getattr(cv2, "legacy", None)):
+            factory = getattr(module, name, None) if module is not None else None
+            if factory is not None:
+                return factory()
+    raise RuntimeError("Aucun tracker OpenCV disponible (KCF/MIL).")
+
+
+class FaceTracker:
+    """
+    Mode suivi : la détection + reconnaissance complète ne tourne qu'une image sur
+    detect_interval (ou dès qu'une piste est perdue) ; entre deux détections,
+    l'identité de chaque visage est propagée par un tracker OpenCV.
+    """
+
+    def __init__(self, detect_interval=10, tracker_factory=create_cv_tracker, profiler=None):
+        self.detect_interval = detect_interval
+        self.tracker_factory = tracker_factory
+        self.profiler = profiler or PipelineProfiler()
+        self._tracks = []  # liste de (tracker, résultat)
+        self._frames_since_detection = 0
+
+    def reset(self):
+        self._tracks = []
+        self._frames_since_detection = 0
+
+    def update(self, frame, recognize):
+        """
+        Retourne les résultats pour l'image : ceux de recognize(frame) lors d'une
+        détection complète, sinon ceux des pistes suivies (marqués "tracked").
+        """
+        if self._tracks and self._frames_since_detection < self.detect_interval:
+            with self.profiler.stage("suivi"):
+                tracked = self._track(frame)
+            if tracked is not None:
+                self._frames_since_detection += 1
+                return tracked
+
+        results = recognize(frame)
+        with self.profiler.stage("suivi_init"):
+            self._start_tracks(frame, results)
+        self._frames_since_detection = 1
+        return results
+
+    def _track(self, frame):
+        """Met à jour toutes les pistes ; retourne None si l'une d'elles est perdue."""
+        height, width = frame.shape[:2]
+        updated = []
+        for tracker, result in self._tracks:
+            ok, (x, y, w, h) = tracker.update(frame)
+            if not ok or w <= 0 or h <= 0 or x + w <= 0 or y + h <= 0 or x >= width or y >= height:
+                return None
+            updated.append(dict(result, bbox=(int(x), int(y), int(x + w), int(y + h)), tracked=True))
+        return updated
+
+    def _start_tracks(self, frame, results):
+        self._tracks = []
+        height, width = frame.shape[:2]
+        for result in results:
+            x1, y1, x2, y2 = result["bbox"]
+            x1, y1 = max(0, x1), max(0, y1)
+            x2, y2 = min(width, x2), min(height, y2)
+            if x2 <= x1 or y2 <= y1:
+                continue
+            try:
+                tracker = self.tracker_factory()
+            except RuntimeError as e:
+                # Sans tracker disponible, on retombe sur une détection à chaque image
+                print(f"[Suivi désactivé] {e}")
+                self._tracks = []
+                return
+            tracker.init(frame, (x1, y1, x2 - x1, y2 - y1))
+            self._tracks.append((tracker, result))
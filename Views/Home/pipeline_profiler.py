@@ -0,0 +1,127 @@
+# pipeline_profiler.py
+import contextlib
+import csv
+import datetime
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+_DISABLED_STAGE = contextlib.nullcontext()
+
+
+class _StageTimer:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class PipelineProfiler:
+    """
+    Temps passé dans chaque étape du pipeline de reconnaissance (capture, conversion,
+    détection, embedding, correspondance, suivi, dessin, QImage, affichage) et cadence
+    des flux (images capturées, analysées, affichées), sur une fenêtre glissante des
+    `window` dernières mesures par étape.
+
+    Désactivé, stage() retourne un contexte vide partagé et tick() ne fait rien : le
+    coût se limite à un appel de méthode par étape. Les mesures viennent de plusieurs
+    threads (capture, reconnaissance, interface) ; les lectures retournent des copies.
+    """
+
+    def __init__(self, window=300, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        self._durations = {}   # {étape: deque des durées en secondes}
+        self._ticks = {}       # {flux: deque des instants perf_counter}
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        """Contexte qui mesure la durée du bloc : with profiler.stage("detection"): ..."""
+        if not self.enabled:
+            return _DISABLED_STAGE
+        return _StageTimer(self, name)
+
+    def record(self, name, seconds):
+        with self._lock:
+            durations = self._durations.get(name)
+            if durations is None:
+                durations = self._durations[name] = deque(maxlen=self.window)
+            durations.append(seconds)
+
+    def tick(self, name):
+        """Compte un événement du flux `name` (une image capturée, affichée...) pour calculer sa cadence."""
+        if not self.enabled:
+            return
+        with self._lock:
+            ticks = self._ticks.get(name)
+            if ticks is None:
+                ticks = self._ticks[name] = deque(maxlen=self.window)
+            ticks.append(time.perf_counter())
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+            self._ticks.clear()
+
+    def snapshot(self):
+        """
+        Statistiques courantes : {"stages": {étape: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}},
+        "fps": {flux: images par seconde}}. Les étapes gardent leur ordre de première mesure.
+        """
+        with self._lock:
+            durations = {name: np.array(values) for name, values in self._durations.items()}
+            ticks = {name: list(values) for name, values in self._ticks.items()}
+        stages = {}
+        for name, values in durations.items():
+            if not len(values):
+                continue
+            p50, p95, p99 = np.percentile(values, (50, 95, 99)) * 1000
+            stages[name] = {"count": len(values), "mean_ms": float(values.mean() * 1000), "p50_ms": float(p50),
+                            "p95_ms": float(p95), "p99_ms": float(p99), "max_ms": float(values.max() * 1000)}
+        fps = {}
+        for name, values in ticks.items():
+            if len(values) >= 2 and values[-1] > values[0]:
+                fps[name] = (len(values) - 1) / (values[-1] - values[0])
+        return {"stages": stages, "fps": fps}
+
+    def format_overlay(self):
+        """Texte court pour l'incrustation à l'écran."""
+        snapshot = self.snapshot()
+        lines = [" | ".join(f"{name} {value:.1f} i/s" for name, value in snapshot["fps"].items())]
+        lines += [f"{name:<15}p50 {stats['p50_ms']:6.1f}  p95 {stats['p95_ms']:6.1f}  max {stats['max_ms']:6.1f} ms"
+                  for name, stats in snapshot["stages"].items()]
+        return "\n".join(line for line in lines if line)
+
+    def export_json(self, path):
+        """Statistiques et durées brutes (ms) de la fenêtre courante."""
+        snapshot = self.snapshot()
+        with self._lock:
+            samples = {name: [round(value * 1000, 3) for value in values] for name, values in self._durations.items()}
+        data = {"generated_at": datetime.datetime.now().isoformat(timespec="seconds"), "window": self.window,
+                **snapshot, "samples_ms": samples}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def export_csv(self, path):
+        """Une ligne par étape (statistiques en ms) puis une ligne par flux (cadence)."""
+        snapshot = self.snapshot()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["etape", "mesures", "moyenne_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "fps"])
+            for name, stats in snapshot["stages"].items():
+                writer.writerow([name, stats["count"]] + [f"{stats[key]:.3f}" for key in
+                                                          ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")] + [""])
+            for name, value in snapshot["fps"].items():
+                writer.writerow([name, "", "", "", "", "", "", f"{value:.2f}"])
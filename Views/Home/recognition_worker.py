@@ -0,0 +1,126 @@
+# recognition_worker.py
+import threading
+
+import cv2
+from PySide6.QtCore import QThread, Signal
+from PySide6.QtGui import QImage
+
+from Views.Home.pipeline_profiler import PipelineProfiler
+
+
+def draw_results(frame, results):
+    """Dessine les cadres et les noms reconnus sur l'image (BGR), en place."""
+    for result in results:
+        x1, y1, x2, y2 = result["bbox"]
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        cv2.putText(frame, result["name"], (x1, y1 - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
+    return frame
+
+
+class FrameGrabber(QThread):
+    """
+    Lit la caméra à sa propre cadence dans un thread dédié.
+    Seule la dernière image est conservée : la reconnaissance et l'affichage
+    prennent toujours l'image la plus récente, les images périmées sont abandonnées.
+    """
+    frame_ready = Signal(QImage)      # Image annotée prête à être affichée
+    stream_failed = Signal(str)       # Ouverture impossible ou flux interrompu
+
+    def __init__(self, source, parent=None, profiler=None):
+        super().__init__(parent)
+        self.source = source
+        self.profiler = profiler or PipelineProfiler()
+        self._condition = threading.Condition()
+        self._latest_frame = None
+        self._frame_id = 0
+        self._results = []
+        self._display_pending = False
+
+    def run(self):
+        capture = cv2.VideoCapture(self.source)
+        if not capture.isOpened():
+            self.stream_failed.emit("Impossible d’accéder à la caméra.")
+            return
+        try:
+            profiler = self.profiler
+            while not self.isInterruptionRequested():
+                with profiler.stage("capture"):
+                    ret, frame = capture.read()
+                if not ret:
+                    self.stream_failed.emit("Flux vidéo terminé ou interrompu.")
+                    break
+                profiler.tick("capturées")
+
+                with self._condition:
+                    self._latest_frame = frame
+                    self._frame_id += 1
+                    results = self._results
+                    self._condition.notify_all()
+
+                # L'interface n'a pas encore affiché l'image précédente : on saute celle-ci
+                if self._display_pending:
+                    continue
+                with profiler.stage("dessin"):
+                    annotated = draw_results(frame.copy(), results)
+                with profiler.stage("qimage"):
+                    h, w, ch = annotated.shape
+                    qimg = QImage(annotated.data, w, h, ch * w, QImage.Format_BGR888).copy()
+                self._display_pending = True
+                self.frame_ready.emit(qimg)
+        finally:
+            capture.release()
+            with self._condition:
+                self._condition.notify_all()
+
+    def frame_displayed(self):
+        """Appelé par l'interface une fois l'image affichée, autorise l'émission de la suivante."""
+        self._display_pending = False
+
+    def wait_for_frame(self, last_frame_id, timeout=0.5):
+        """Bloque jusqu'à l'arrivée d'une image plus récente que last_frame_id ; retourne (id, image) ou (id, None)."""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._frame_id != last_frame_id or not self.isRunning(), timeout)
+            if self._frame_id == last_frame_id:
+                return last_frame_id, None
+            return self._frame_id, self._latest_frame
+
+    def set_results(self, results):
+        """Met à jour les résultats dessinés sur les images suivantes."""
+        with self._condition:
+            self._results = results
+
+
+class RecognitionThread(QThread):
+    """
+    Exécute la détection et la reconnaissance à sa propre cadence sur la dernière
+    image du FrameGrabber. recognize(frame_bgr) doit retourner une liste de
+    dictionnaires {"bbox", "name", "score", "id"}.
+    """
+    results_ready = Signal(list)
+
+    def __init__(self, grabber, recognize, parent=None, profiler=None):
+        super().__init__(parent)
+        self.grabber = grabber
+        self.recognize = recognize
+        self.profiler = profiler or PipelineProfiler()
+
+    def run(self):
+        last_frame_id = 0
+        while not self.isInterruptionRequested():
+            frame_id, frame = self.grabber.wait_for_frame(last_frame_id)
+            if frame is None:
+                if not self.grabber.isRunning():
+                    break
+                continue
+            last_frame_id = frame_id
+            try:
+                with self.profiler.stage("traitement"):
+                    results = self.recognize(frame)
+            except Exception as e:
+                print(f"[Erreur de reconnaissance] {e}")
+                continue
+            self.profiler.tick("analysées")
+            self.grabber.set_results(results)
+            self.results_ready.emit(results)
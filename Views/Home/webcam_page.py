@@ -1,46 +1,82 @@
 import cv2
-import numpy as np
-import datetime
-from insightface.app import FaceAnalysis
-import  os
 from PySide6.QtWidgets import *
 from PySide6.QtGui import *
 from PySide6.QtCore import *
 
 from Controllers.chauffeur_controller import CHAUFFEUR_CONTROLLER
 from Controllers.image_controller import IMAGE_CONTROLLER
+from Controllers.camera_discovery_controller import CameraDiscoveryController
+from Controllers.recognition_log_controller import RecognitionLogController
+from Controllers.historique_recorder import HISTORIQUE_RECORDER, get_history_recorder
+from Views.Home.recognition_worker import FrameGrabber, RecognitionThread
+from Views.Home.face_tracker import FaceTracker
+from Views.Home.face_engine_manager import get_face_engine, DEFAULT_PROFILE
+from Views.Home.face_database import FaceDatabase
+from Views.Home.pipeline_profiler import PipelineProfiler
 
 
 class ACCER_WEBCAMERA(QMainWindow):
     mainwindow_signal = Signal()
+    # Chauffeur reconnu (nouvelle détection, pas un résultat propagé par le tracker)
+    driver_recognized = Signal(int, str, float)
+    # Fin du chargement de la galerie (thread de mise à jour) : erreur ou None
+    face_database_loaded = Signal(object)
 
-    def __init__(self):
+    def __init__(self, engine_profile=DEFAULT_PROFILE, alcohol_test=None):
         super().__init__()
         self.setWindowTitle("GESTION DE LA RECONNAISSANCE FACIALE")
 
-        # Initialise le moteur InsightFace
-        self.face_engine = FaceAnalysis(name='buffalo_l', providers=['CPUExecutionProvider'])
-        self.face_engine.prepare(ctx_id=0)
-
-        # Données nécessaires à la reconnaissance
-        self.face_db = []
-        self.recognition_threshold = 0.65
-        self.cap = None
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self._update_frame)
+        # Moteur InsightFace partagé par toute l'application, construit au premier usage
+        self.engine_profile = engine_profile
 
         # Contrôleurs
         self.person_controller = CHAUFFEUR_CONTROLLER()
         self.image_controller = IMAGE_CONTROLLER()
 
+        # Galerie des visages (index interchangeable) tenue à jour en arrière-plan à chaque
+        # ajout, modification ou suppression de photo, sans rechargement complet
+        self.recognition_threshold = 0.65
+        self.face_database = FaceDatabase(self.person_controller, self.image_controller,
+                                          threshold=self.recognition_threshold,
+                                          engine_profile=engine_profile)
+        IMAGE_CONTROLLER.add_listener(self.face_database.on_image_event)
+
+        # Journal des reconnaissances : file + thread d'écriture, debounce par chauffeur
+        self.recognition_log = RecognitionLogController("reconnaissance_log.txt", debounce_s=10.0)
+        # Historique en base, inséré par lots depuis un thread dédié
+        self.history_recorder = get_history_recorder()
+
+        # Capture et inférence tournent chacune dans leur propre thread
+        self.grabber = None
+        self.recognition_thread = None
+
+        # Temps par étape du pipeline (désactivé par défaut, voir la case "Mesures")
+        self.profiler = PipelineProfiler()
+
+        # Mode suivi : détection complète une image sur N, tracker OpenCV entre les deux
+        self.tracking_enabled = True
+        self.face_tracker = FaceTracker(detect_interval=10, profiler=self.profiler)
+
         # États d’interface
         self.saved_urls = []
         self.active_url = None
         self.fullscreen = False
 
         self._setup_ui()
+        self.face_database_loaded.connect(self._on_face_database_loaded)
         self._load_face_database()
 
+        # Test d'alcool déclenché par la reconnaissance (ALCOOL_TEST_CONTROLLER), facultatif
+        self.alcohol_test = alcohol_test
+        if alcohol_test is not None:
+            self.driver_recognized.connect(alcohol_test.on_driver_recognized)
+            alcohol_test.session_started.connect(self._on_alcohol_test_started)
+            alcohol_test.session_finished.connect(self._on_alcohol_test_finished)
+
+    @property
+    def face_engine(self):
+        return get_face_engine(self.engine_profile)
+
     def _setup_ui(self):
         central_widget = QWidget()
         layout = QVBoxLayout(central_widget)
@@ -50,6 +86,11 @@ class ACCER_WEBCAMERA(QMainWindow):
         self.label_video.setScaledContents(True)
         layout.addWidget(self.label_video)
 
+        self.alcohol_status_label = QLabel("")
+        self.alcohol_status_label.setAlignment(Qt.AlignCenter)
+        self.alcohol_status_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(self.alcohol_status_label)
+
         controls = QHBoxLayout()
         # controls.addStretch()
 
@@ -62,9 +103,14 @@ class ACCER_WEBCAMERA(QMainWindow):
         self.connect_url_button.clicked.connect(self._handle_url_connection)
         controls.addWidget(self.connect_url_button)
 
+        # La liste est remplie de façon asynchrone par la recherche de caméras
         self.cam_selector = QComboBox()
-        self.cam_selector.addItems(self._detect_local_cameras())
+        self.cam_selector.addItem("Recherche des caméras...")
+        self.cam_selector.setEnabled(False)
         controls.addWidget(self.cam_selector)
+        self.camera_discovery = CameraDiscoveryController()
+        self.camera_discovery.cameras_found.connect(self._populate_cameras)
+        self.camera_discovery.discover()
         controls.addStretch()
 
         self.connect_local_button = QPushButton("Activer Webcam")
@@ -77,6 +123,29 @@ class ACCER_WEBCAMERA(QMainWindow):
         controls.addWidget(self.stop_button)
         controls.addStretch()
 
+        self.tracking_checkbox = QCheckBox("Mode suivi")
+        self.tracking_checkbox.setChecked(self.tracking_enabled)
+        self.tracking_checkbox.toggled.connect(self._toggle_tracking)
+        controls.addWidget(self.tracking_checkbox)
+
+        self.detect_interval_input = QSpinBox()
+        self.detect_interval_input.setRange(1, 100)
+        self.detect_interval_input.setValue(self.face_tracker.detect_interval)
+        self.detect_interval_input.setPrefix("Détection / ")
+        self.detect_interval_input.setSuffix(" images")
+        self.detect_interval_input.valueChanged.connect(self._set_detect_interval)
+        controls.addWidget(self.detect_interval_input)
+        controls.addStretch()
+
+        self.profiler_checkbox = QCheckBox("Mesures")
+        self.profiler_checkbox.toggled.connect(self._toggle_profiler)
+        controls.addWidget(self.profiler_checkbox)
+
+        self.export_profile_button = QPushButton("Exporter mesures")
+        self.export_profile_button.clicked.connect(self._export_profile)
+        controls.addWidget(self.export_profile_button)
+        controls.addStretch()
+
         self.fullscreen_button = QPushButton("Plein écran")
         self.fullscreen_button.clicked.connect(self._toggle_fullscreen)
         controls.addWidget(self.fullscreen_button)
@@ -85,16 +154,25 @@ class ACCER_WEBCAMERA(QMainWindow):
         layout.addLayout(controls)
         self.setCentralWidget(central_widget)
 
+        # Incrustation des mesures en haut à gauche de la vidéo, rafraîchie deux fois par seconde
+        self.profiler_overlay = QLabel(self.label_video)
+        self.profiler_overlay.setStyleSheet("background-color: rgba(0, 0, 0, 160); color: #00ff00; "
+                                            "font-family: monospace; padding: 4px;")
+        self.profiler_overlay.move(8, 8)
+        self.profiler_overlay.hide()
+        self.profiler_timer = QTimer(self)
+        self.profiler_timer.setInterval(500)
+        self.profiler_timer.timeout.connect(self._refresh_profiler_overlay)
 
 
-    def _detect_local_cameras(self):
-        available = []
-        for index in range(5):
-            cap = cv2.VideoCapture(index)
-            if cap.read()[0]:
-                available.append(f"Caméra {index}")
-                cap.release()
-        return available or ["Aucune caméra détectée"]
+
+    def _populate_cameras(self, cameras):
+        self.cam_selector.clear()
+        for index, label in cameras.items():
+            self.cam_selector.addItem(label, index)
+        if not cameras:
+            self.cam_selector.addItem("Aucune caméra détectée")
+        self.cam_selector.setEnabled(bool(cameras))
 
     def _handle_url_connection(self):
         url = self.url_input.text().strip()
@@ -106,30 +184,84 @@ class ACCER_WEBCAMERA(QMainWindow):
         self.url_input.setText("Connecté")
 
     def _start_local_camera(self):
-        try:
-            index = int(self.cam_selector.currentText().split()[-1])
-            self._open_camera(index)
-        except Exception:
+        index = self.cam_selector.currentData()
+        if index is None:
             QMessageBox.warning(self, "Erreur", "Sélection de caméra invalide.")
+            return
+        self._open_camera(index)
 
     def _open_camera(self, source):
         self._stop_camera()
-        self.cap = cv2.VideoCapture(source)
-        if self.cap.isOpened():
-            self.timer.start(30)
-            if isinstance(source, str):
-                self.active_url = source
-        else:
-            QMessageBox.critical(self, "Erreur", "Impossible d’accéder à la caméra.")
+        self.grabber = FrameGrabber(source, self, profiler=self.profiler)
+        self.grabber.frame_ready.connect(self._display_frame)
+        self.grabber.stream_failed.connect(self._on_stream_failed)
+        self.face_tracker.reset()
+        self.recognition_thread = RecognitionThread(self.grabber, self._process_frame, self, profiler=self.profiler)
+        self.recognition_thread.results_ready.connect(self._on_recognition_results)
+
+        # Le grabber doit tourner avant que le thread de reconnaissance n'attende ses images
+        self.grabber.start()
+        self.recognition_thread.start()
+        if isinstance(source, str):
+            self.active_url = source
 
     def _stop_camera(self):
-        self.timer.stop()
-        if self.cap:
-            self.cap.release()
-        self.cap = None
+        for thread in (self.recognition_thread, self.grabber):
+            if thread is not None:
+                thread.requestInterruption()
+        for thread in (self.grabber, self.recognition_thread):
+            if thread is not None:
+                thread.wait()
+                thread.deleteLater()
+        self.grabber = None
+        self.recognition_thread = None
         self.label_video.clear()
         self.url_input.setText("")
 
+    def _on_stream_failed(self, message):
+        self._stop_camera()
+        QMessageBox.critical(self, "Erreur", message)
+
+    def closeEvent(self, event):
+        self._stop_camera()
+        super().closeEvent(event)
+
+    def _toggle_tracking(self, enabled):
+        self.tracking_enabled = enabled
+        self.detect_interval_input.setEnabled(enabled)
+
+    def _set_detect_interval(self, value):
+        self.face_tracker.detect_interval = value
+
+    def _toggle_profiler(self, enabled):
+        self.profiler.reset()
+        self.profiler.enabled = enabled
+        self.profiler_overlay.setVisible(enabled)
+        if enabled:
+            self.profiler_overlay.setText("Mesures en cours...")
+            self.profiler_overlay.adjustSize()
+            self.profiler_timer.start()
+        else:
+            self.profiler_timer.stop()
+
+    def _refresh_profiler_overlay(self):
+        self.profiler_overlay.setText(self.profiler.format_overlay() or "Mesures en cours...")
+        self.profiler_overlay.adjustSize()
+        self.profiler_overlay.raise_()
+
+    def _export_profile(self):
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Exporter les mesures", "mesures_pipeline.csv", "CSV (*.csv);;JSON (*.json)")
+        if not path:
+            return
+        try:
+            if path.lower().endswith(".json") or selected_filter.startswith("JSON"):
+                self.profiler.export_json(path)
+            else:
+                self.profiler.export_csv(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Erreur", f"Impossible d'exporter les mesures : {e}")
+
     def _toggle_fullscreen(self):
         self.fullscreen = not self.fullscreen
         if self.fullscreen:
@@ -140,97 +272,69 @@ class ACCER_WEBCAMERA(QMainWindow):
             self.fullscreen_button.setText("Plein écran")
 
 
-    """Charge les visages des chauffeurs depuis la base de données pour la reconnaissance."""
     def _load_face_database(self):
-        self.face_db.clear()  # Vide la base de données de visages existante
-        try:
-            # Récupère toutes les photos enregistrées
-            images = self.image_controller.get_all_photos()
-
-            # S'assurer que images est une liste/itérable, même s'il n'y a qu'un seul élément
-            if not isinstance(images, (list, tuple)):
-                if images is None:
-                    images = []
-                else:
-                    images = [images]
-
-            for image_obj in images:  # 'image_obj' est un objet image (ex: MockImage)
-                img_path = image_obj.url  # Accède à l'URL de l'image directement depuis l'objet image
-
-                # Vérifiez si le fichier image existe avant de le lire
-                if not os.path.exists(img_path):
-                    QMessageBox.critical(f"Attention: Le fichier image n'existe pas : {img_path}. Ignoré.")
-                    continue
-
-                img = cv2.imread(img_path)
-                if img is None:
-                    print(f"Attention: Impossible de charger l'image depuis {img_path}. Fichier corrompu ou illisible.")
-                    continue
-
-                # Récupère les détails du chauffeur associé à cette image
-                person = self.person_controller.get_driver_by_id(image_obj.personne_id)
-                if person is None:
-                    print(
-                        f"Attention: Chauffeur avec ID {image_obj.personne_id} non trouvé pour l'image {img_path}. Ignoré.")
-                    continue
-
-                # Détecte les visages dans l'image
-                faces = self.face_engine.get(img)
-                if not faces:
-                    print(f"Attention: Aucun visage détecté dans l'image {img_path}. Ignoré.")
-                    continue
-
-                # Si plusieurs visages sont détectés, nous prenons le premier comme référence du profil
-                # Ajustez cette logique si vous avez besoin de gérer plusieurs visages par photo de profil
-                self.face_db.append({
-                    "nom": f"{person.nom} {person.prenom} | Tel: {person.telephone} | Email: {person.email} | Permis: {person.numero_permis} | Sexe: {person.sex}",
-                    "embedding": faces[0].embedding,  # Utilise l'embedding du premier visage détecté
-                    "fonction": getattr(person, "fonction", None),
-                    # Utilise getattr pour une gestion sécurisée des attributs
-                    "id": getattr(person, "id", None)
-                })
-            print(f"Base de données de visages chargée avec {len(self.face_db)} profils.")
-
-        except Exception as e:
-            print(f"Erreur de chargement des visages : {e}")
+        """
+        Charge les visages des chauffeurs depuis la base de données pour la reconnaissance,
+        en arrière-plan (thread de mise à jour de la galerie) : la fenêtre reste utilisable
+        pendant l'encodage des nouvelles photos.
+        """
+        self.face_database.request_reload(on_done=self.face_database_loaded.emit)
+
+    def _on_face_database_loaded(self, error):
+        if error is not None:
             QMessageBox.critical(self, "Erreur de chargement",
-                                 f"Impossible de charger la base de données de visages: {e}")
-
-    def _log_recognition(self, name, score):
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with open("reconnaissance_log.txt", "a") as f:
-            f.write(f"[{timestamp}] {name} - Score : {score:.4f}\n")
-
-    def _update_frame(self):
-        if not self.cap or not self.cap.isOpened():
-            return
-        ret, frame = self.cap.read()
-        if not ret:
-            return
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        faces = self.face_engine.get(rgb_frame)
-
-        for face in faces:
-            bbox = face.bbox.astype(int)
-            cv2.rectangle(frame, (bbox[0], bbox[1]), (bbox[2], bbox[3]), (0, 255, 0), 2)
-
-            name = "Inconnu"
-            best_score = 0.0
-
-            for profile in self.face_db:
-                sim = np.dot(face.embedding, profile["embedding"]) / (
-                        np.linalg.norm(face.embedding) * np.linalg.norm(profile["embedding"])
-                )
-                if sim > self.recognition_threshold and sim > best_score:
-                    name = profile["nom"]
-                    best_score = sim
-
-            cv2.putText(frame, name, (bbox[0], bbox[1] - 10),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
-
-            if name != "Inconnu":
-                self._log_recognition(name, best_score)
-
-        h, w, ch = frame.shape
-        qimg = QImage(frame.data, w, h, ch * w, QImage.Format_BGR888)
-        self.label_video.setPixmap(QPixmap.fromImage(qimg))
+                                 f"Impossible de charger la base de données de visages: {error}")
+
+    def _log_recognition(self, identity, name, score):
+        # Journal texte (debounce par chauffeur) ; l'historique en base suit le même rythme
+        if self.recognition_log.log(identity, name, score):
+            self.history_recorder.record(identity, HISTORIQUE_RECORDER.EVENT_RECONNAISSANCE)
+
+    def _process_frame(self, frame):
+        """Point d'entrée du thread de reconnaissance : passe par le tracker si le mode suivi est actif."""
+        if self.tracking_enabled:
+            return self.face_tracker.update(frame, self._recognize)
+        self.face_tracker.reset()
+        return self._recognize(frame)
+
+    def _recognize(self, frame):
+        """Détecte et identifie les visages d'une image ; exécuté dans le thread de reconnaissance."""
+        profiler = self.profiler
+        with profiler.stage("conversion"):
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if profiler.enabled:
+            # Détection et embedding mesurés séparément (même résultat que detect_faces)
+            with profiler.stage("detection"):
+                faces = self.face_engine.detect(rgb_frame)
+            with profiler.stage("embedding"):
+                self.face_engine.embed(rgb_frame, faces)
+        else:
+            faces = self.face_engine.detect_faces(rgb_frame)
+        with profiler.stage("correspondance"):
+            matches = self.face_database.identify_batch([face.embedding for face in faces])
+        return [dict(match, bbox=tuple(int(v) for v in face.bbox))
+                for face, match in zip(faces, matches)]
+
+    def _on_recognition_results(self, results):
+        for result in results:
+            # Les résultats propagés par le tracker ne sont pas de nouvelles reconnaissances
+            if result["id"] is not None and not result.get("tracked"):
+                self._log_recognition(result["id"], result["name"], result["score"])
+                self.driver_recognized.emit(result["id"], result["name"], result["score"])
+
+    def _on_alcohol_test_started(self, chauffeur_id, name):
+        self.alcohol_status_label.setText(f"Test d'alcool en cours : {name} — soufflez vers le capteur")
+        self.alcohol_status_label.setStyleSheet("font-weight: bold; color: #1565c0;")
+
+    def _on_alcohol_test_finished(self, verdict):
+        colors = {"POSITIF": "red", "NEGATIF": "green"}
+        details = "" if verdict["alcool_max"] is None else f" (max {verdict['alcool_max']:.0f})"
+        self.alcohol_status_label.setText(f"{verdict['nom']} : {verdict['resultat']}{details}")
+        self.alcohol_status_label.setStyleSheet(f"font-weight: bold; color: {colors.get(verdict['resultat'], 'orange')};")
+
+    def _display_frame(self, qimg):
+        with self.profiler.stage("affichage"):
+            self.label_video.setPixmap(QPixmap.fromImage(qimg))
+        self.profiler.tick("affichées")
+        if self.grabber is not None:
+            self.grabber.frame_displayed()
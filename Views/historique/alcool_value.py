@@ -1,35 +1,53 @@
+import sys
+
 import serial  # Importation de la bibliothèque pour la communication série
-from Views.Home.login_page import LOGINWINDOW
+from PySide6.QtCore import QCoreApplication
+
+from Controllers.arduino_controller import ArduinoController
+
 
 class ALCOOL_VALUE:
+    """
+    Surveillance en console des valeurs d'alcool envoyées par l'Arduino. Les mesures
+    arrivent par signaux du contrôleur Arduino (thread de lecture, lots de mesures) : rien
+    ne bloque et rien n'est exécuté à l'import. Le test d'un chauffeur reconnu (verdict
+    inscrit dans l'historique) est géré par Controllers.alcool_test_controller.
+    """
+
     SEUIL_ALCOOL = 400  # Seuil défini dans le programme Arduino
 
-    def __init__(self):
-        super().__init__()
-        self.login = LOGINWINDOW()
-        arduino_port_value=self.login._connect_to_arduino
-        # Initialisation de la connexion série avec l'Arduino
-        self.arduino = serial.Serial(arduino_port_value)  # Assurez-vous d'ajuster le port COM selon votre système
-
-    def lire_donnees(self):
-        """Lit la valeur envoyée par l'Arduino et affiche si elle dépasse le seuil."""
-        try:
-            ligne = self.arduino.readline().decode().strip()  # Lecture et décodage de la ligne reçue depuis l'Arduino
-
-            # Vérification si la ligne contient les données de mesure
-            if ligne.startswith("Valeur d'alcool détectée"):
-                valeur = int(ligne.split(": ")[1])  # Extraction de la valeur numérique
-                print(f"Valeur reçue : {valeur}")
-
-                # Vérification si la valeur dépasse le seuil défini
-                if valeur > self.SEUIL_ALCOOL:
-                    print("⚠️ Alcool détecté au-dessus du seuil !")
-        except Exception as e:
-            print(f"Erreur lors de la lecture des données : {str(e)}")  # Gestion des erreurs potentielles
-
-# Création d'une instance de la classe ALCOOL_VALUE
-detecteur_alcool = ALCOOL_VALUE()
-
-# Boucle infinie pour surveiller les niveaux d'alcool en temps réel
-while True:
-    detecteur_alcool.lire_donnees()
\ No newline at end of file
+    def __init__(self, arduino_controller):
+        self.arduino_controller = arduino_controller
+        self.arduino_controller.enable_batching()
+        self.arduino_controller.samples_received.connect(self.lire_donnees)
+        self.arduino_controller.connection_status_changed.connect(self.on_connection_changed)
+
+    def lire_donnees(self, samples):
+        """Affiche le dernier lot de mesures et signale celles qui dépassent le seuil."""
+        valeur = float(samples["alcohol"].max())
+        print(f"Valeur reçue : {valeur:g} ({len(samples)} mesures)")
+        # Vérification si la valeur dépasse le seuil défini
+        if valeur > self.SEUIL_ALCOOL:
+            print("⚠️ Alcool détecté au-dessus du seuil !")
+
+    def on_connection_changed(self, connected):
+        if not connected:
+            print("Arduino déconnecté")
+            QCoreApplication.quit()
+
+
+if __name__ == "__main__":
+    # Usage : python -m Views.historique.alcool_value <port série>
+    app = QCoreApplication(sys.argv)
+    controller = ArduinoController()
+    try:
+        controller.serial_connection = serial.Serial(sys.argv[1], baudrate=controller.baudrate,
+                                                     timeout=controller.READ_TIMEOUT)
+    except (IndexError, serial.SerialException) as e:
+        print(f"Erreur lors de l'ouverture du port série : {e}")
+        sys.exit(1)
+    detecteur_alcool = ALCOOL_VALUE(controller)
+    controller.start_reading()
+    code = app.exec()
+    controller.close_connection()
+    sys.exit(code)
@@ -1,12 +1,18 @@
 from PySide6.QtWidgets import *
 from PySide6.QtCore import *
 from PySide6.QtGui import *
+from Controllers.chauffeur_controller import CHAUFFEUR_CONTROLLER
 from Controllers.historique_controller import HISTORIQUE_CONTROLLER
+from Controllers.historique_recorder import HISTORIQUE_RECORDER
+from Views.historique.history_table_model import HistoryTableModel
+import datetime
 import logging
 
 class DISPLAY_HISTORY(QWidget):
     """
     Widget pour afficher et gérer l'historique des événements.
+    Les filtres (période, type d'événement, chauffeur) sont appliqués en SQL et les
+    lignes sont chargées par pages au fil du défilement.
     """
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -15,61 +21,127 @@ class DISPLAY_HISTORY(QWidget):
 
         # Initialisation des objets
         self.history_controller = HISTORIQUE_CONTROLLER()
-        self.all_history = []
+        self.chauffeur_controller = CHAUFFEUR_CONTROLLER()
+        self.history_model = HistoryTableModel(self.history_controller, parent=self)
 
         logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
         self.logger = logging.getLogger(__name__)
 
+        # Regroupe les modifications rapprochées des filtres en une seule requête
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(300)
+        self.filter_timer.timeout.connect(self.load_history_from_controller)
+
         self.setup_ui()
-        # QTimer.singleShot(0, self.load_history_from_controller)
+        # Une seule page est lue au départ : le chargement reste léger quelle que soit la taille de la table
+        QTimer.singleShot(0, self.refresh)
 
     def setup_ui(self):
         """Configure l'interface utilisateur pour l'affichage de l'historique."""
         main_layout = QVBoxLayout()
 
-        # Barre d'outils supérieure
+        # Barre d'outils supérieure : filtres
         toolbar_layout = QHBoxLayout()
-        
-        self.search_edit = QLineEdit()
-        self.search_edit.setPlaceholderText("Rechercher par type d'événement")
-        self.search_edit.textChanged.connect(self.filter_history)
-        toolbar_layout.addWidget(self.search_edit)
+
+        self.date_filter_checkbox = QCheckBox("Du")
+        self.date_filter_checkbox.toggled.connect(self._on_date_filter_toggled)
+        toolbar_layout.addWidget(self.date_filter_checkbox)
+
+        self.start_date_edit = QDateEdit(QDate.currentDate().addDays(-7))
+        self.start_date_edit.setCalendarPopup(True)
+        self.start_date_edit.setEnabled(False)
+        self.start_date_edit.dateChanged.connect(self.schedule_filter)
+        toolbar_layout.addWidget(self.start_date_edit)
+
+        toolbar_layout.addWidget(QLabel("au"))
+        self.end_date_edit = QDateEdit(QDate.currentDate())
+        self.end_date_edit.setCalendarPopup(True)
+        self.end_date_edit.setEnabled(False)
+        self.end_date_edit.dateChanged.connect(self.schedule_filter)
+        toolbar_layout.addWidget(self.end_date_edit)
+
+        self.event_type_combo = QComboBox()
+        self.event_type_combo.addItem("Tous les événements", None)
+        self.event_type_combo.addItem("Reconnaissance", HISTORIQUE_RECORDER.EVENT_RECONNAISSANCE)
+        self.event_type_combo.addItem("Test d'alcool", HISTORIQUE_RECORDER.EVENT_TEST_ALCOOL)
+        self.event_type_combo.currentIndexChanged.connect(self.schedule_filter)
+        toolbar_layout.addWidget(self.event_type_combo)
+
+        self.driver_combo = QComboBox()
+        self.driver_combo.addItem("Tous les chauffeurs", None)
+        self.driver_combo.currentIndexChanged.connect(self.schedule_filter)
+        toolbar_layout.addWidget(self.driver_combo)
 
         self.refresh_button = QPushButton("Actualiser")
-        self.refresh_button.clicked.connect(self.load_history_from_controller)
+        self.refresh_button.clicked.connect(self.refresh)
         toolbar_layout.addWidget(self.refresh_button)
 
         main_layout.addLayout(toolbar_layout)
 
-        # Zone d'affichage des événements historiques
-        self.history_list_widget = QListWidget()
-        main_layout.addWidget(self.history_list_widget)
+        # Zone d'affichage des événements historiques (chargement par pages)
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_model)
+        self.history_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.history_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.history_table.verticalHeader().setVisible(False)
+        self.history_table.horizontalHeader().setStretchLastSection(True)
+        main_layout.addWidget(self.history_table)
 
         self.setLayout(main_layout)
 
+    def _on_date_filter_toggled(self, checked):
+        self.start_date_edit.setEnabled(checked)
+        self.end_date_edit.setEnabled(checked)
+        self.schedule_filter()
+
+    def schedule_filter(self, *args):
+        self.filter_timer.start()
+
+    def refresh(self):
+        """Recharge la liste des chauffeurs puis l'historique."""
+        self.load_drivers()
+        self.load_history_from_controller()
+
+    def load_drivers(self):
+        current = self.driver_combo.currentData()
+        self.driver_combo.blockSignals(True)
+        self.driver_combo.clear()
+        self.driver_combo.addItem("Tous les chauffeurs", None)
+        try:
+            for chauffeur in self.chauffeur_controller.iter_drivers():
+                self.driver_combo.addItem(f"{chauffeur.nom} {chauffeur.prenom or ''}".strip(), chauffeur.id)
+        except Exception as e:
+            self.logger.error(f"Erreur lors du chargement des chauffeurs: {e}")
+        index = self.driver_combo.findData(current)
+        self.driver_combo.setCurrentIndex(max(index, 0))
+        self.driver_combo.blockSignals(False)
+
+    def current_filters(self):
+        filters = {
+            "event_type": self.event_type_combo.currentData(),
+            "chauffeur_id": self.driver_combo.currentData(),
+        }
+        if self.date_filter_checkbox.isChecked():
+            start = self.start_date_edit.date().toPython()
+            end = self.end_date_edit.date().toPython()
+            filters["start_date"] = datetime.datetime.combine(start, datetime.time.min)
+            filters["end_date"] = datetime.datetime.combine(end, datetime.time.max)
+        return filters
+
     def load_history_from_controller(self):
-        """Charge l'historique depuis le contrôleur et l'affiche."""
+        """Charge la première page de l'historique correspondant aux filtres."""
         try:
-            self.all_history = self.history_controller.get_histories()
-            self._display_history(self.all_history)
+            self.history_model.set_filters(**self.current_filters())
+            self.history_table.scrollToTop()
         except Exception as e:
             self.logger.error(f"Erreur lors du chargement de l'historique: {e}")
             self.show_message("Erreur", "Impossible de charger l'historique.")
 
-    def _display_history(self, histories):
-        """Affiche les événements historiques dans la liste."""
-        self.history_list_widget.clear()
-        for history in histories:
-            item = QListWidgetItem(f"{history.jour_heure} - {history.event_type}")
-            self.history_list_widget.addItem(item)
-
-    def filter_history(self, text):
-        """Filtre l'historique affiché en fonction du type d'événement."""
-        if not text:
-            self._display_history(self.all_history)
-            return
-        filtered_histories = [h for h in self.all_history if text.lower() in h.event_type.lower()]
-        self._display_history(filtered_histories)
+    def filter_history(self, *args):
+        """Applique immédiatement les filtres courants."""
+        self.filter_timer.stop()
+        self.load_history_from_controller()
 
     def show_message(self, title, message):
         """Affiche une boîte de message informative."""
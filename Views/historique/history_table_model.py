@@ -0,0 +1,74 @@
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class HistoryTableModel(QAbstractTableModel):
+    """
+    Modèle de l'historique lu page par page : la vue appelle fetchMore() quand elle
+    approche de la fin des lignes chargées, et seule la page suivante est demandée à
+    HISTORIQUE_CONTROLLER.filter_history (filtres et tri exécutés en SQL).
+    """
+
+    HEADERS = ["Date et heure", "Événement", "Chauffeur", "Résultat"]
+
+    def __init__(self, history_controller, page_size=200, parent=None):
+        super().__init__(parent)
+        self.history_controller = history_controller
+        self.page_size = page_size
+        self.filters = {}
+        self._rows = []
+        self._exhausted = True
+
+    def set_filters(self, **filters):
+        """Remplace les filtres (start_date, end_date, event_type, chauffeur_id) et recharge la première page."""
+        self.beginResetModel()
+        self.filters = {key: value for key, value in filters.items() if value}
+        self._rows = []
+        self._exhausted = False
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        after = (self._rows[-1].jour_heure, self._rows[-1].id) if self._rows else None
+        page = self.history_controller.filter_history(after=after, limit=self.page_size, **self.filters)
+        if len(page) < self.page_size:
+            self._exhausted = True
+        if not page:
+            return
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        history = self._rows[index.row()]
+        column = index.column()
+        if column == 0:
+            return history.jour_heure.strftime("%Y-%m-%d %H:%M:%S") if history.jour_heure else ""
+        if column == 1:
+            return history.event_type
+        if column == 3:
+            if not history.resultat:
+                return ""
+            if history.alcool_max is None:
+                return history.resultat
+            return (f"{history.resultat} (max {history.alcool_max:.0f}, moy. {history.alcool_moyen:.0f}, "
+                    f"{history.duree_depassement or 0:.1f} s au-dessus du seuil)")
+        chauffeur = history.chauffeur
+        return f"{chauffeur.nom} {chauffeur.prenom or ''}".strip() if chauffeur else str(history.chauffeur_id)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
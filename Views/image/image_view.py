@@ -136,15 +136,23 @@ class IMAGE_VIEW(QWidget):
             # Vous pourriez passer l'ID du chauffeur à la CameraView si nécessaire
             self.camera_view.set_chauffeur_id(self.selected_chauffeur_id)
             self.camera_view.show()
-            # Connecter un signal de la CameraView pour récupérer le chemin de l'image enregistrée
-            self.camera_view.finished.connect(self.handle_captured_image_path) # Assurez-vous que 'finished' est émis
+            # Chaque cliché de la capture automatique est enregistré : la reconnaissance
+            # agrège toutes les photos d'un chauffeur dans son profil
+            self.captured_photos_count = 0
+            self.camera_view.image_captured_signal.connect(self.handle_captured_image_path)
+            self.camera_view.finished.connect(self.handle_capture_finished)
         else:
             QMessageBox.warning(self, "Avertissement", "Veuillez sélectionner un chauffeur avant d'ouvrir la caméra.")
 
     def handle_captured_image_path(self, file_path):
-        """Récupère le chemin de l'image capturée depuis la CameraView."""
-        if file_path:
-            self.add_photo_to_database(file_path)
+        """Enregistre en base une image capturée par la CameraView (sans boîte de dialogue par cliché)."""
+        if file_path and self.photo_controller.add_photo(file_path, self.selected_chauffeur_id):
+            self.captured_photos_count += 1
+
+    def handle_capture_finished(self, message):
+        """Affiche le bilan de la capture automatique."""
+        QMessageBox.information(self, "Résultat",
+                                f"{self.captured_photos_count} photo(s) ajoutée(s) pour le chauffeur sélectionné.")
 
     def browse_image(self):
         """Ouvre une boîte de dialogue pour sélectionner une image existante."""
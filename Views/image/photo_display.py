@@ -1,11 +1,12 @@
 import os
 import logging
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import Qt, QTimer, QSize
 from PySide6.QtWidgets import *
 
 from Controllers.chauffeur_controller import CHAUFFEUR_CONTROLLER
 from Controllers.image_controller import IMAGE_CONTROLLER
+from Views.image.photo_list_model import PhotoListModel, PHOTO_ID_ROLE
+from Views.image.thumbnail_cache import THUMBNAIL_SIZE
 
 class DISPLAY_IMAGES(QWidget):
     def __init__(self, parent=None):
@@ -17,6 +18,10 @@ class DISPLAY_IMAGES(QWidget):
         self.person_controller = CHAUFFEUR_CONTROLLER()
 
         self.all_photos = []
+        # Index construit à chaque chargement : {id photo: nom affiché}, et sa version
+        # en minuscules pour la recherche, afin de filtrer sans interroger la base
+        self.photo_names = {}
+        self.search_index = []
 
         logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
         self.logger = logging.getLogger(__name__)
@@ -38,82 +43,81 @@ class DISPLAY_IMAGES(QWidget):
         self.refresh_button.clicked.connect(self.load_images_from_controller)
         toolbar_layout.addWidget(self.refresh_button)
 
-        main_layout.addLayout(toolbar_layout)
+        self.modify_button = QPushButton("Modifier")
+        self.modify_button.clicked.connect(lambda: self._on_selected(self.modify_image))
+        toolbar_layout.addWidget(self.modify_button)
+
+        self.delete_button = QPushButton("Supprimer")
+        self.delete_button.clicked.connect(lambda: self._on_selected(self.delete_image))
+        toolbar_layout.addWidget(self.delete_button)
 
-        # Grille des images
-        self.image_grid_widget = QWidget()
-        self.image_grid_layout = QGridLayout()
-        self.image_grid_widget.setLayout(self.image_grid_layout)
+        main_layout.addLayout(toolbar_layout)
 
-        self.image_scroll = QScrollArea()
-        self.image_scroll.setWidgetResizable(True)
-        self.image_scroll.setWidget(self.image_grid_widget)
-        main_layout.addWidget(self.image_scroll)
+        # Grille virtualisée : seules les cellules visibles sont dessinées et
+        # leurs miniatures chargées (voir PhotoListModel / ThumbnailCache)
+        self.photo_model = PhotoListModel(parent=self)
+        self.image_view = QListView()
+        self.image_view.setViewMode(QListView.IconMode)
+        self.image_view.setResizeMode(QListView.Adjust)
+        self.image_view.setMovement(QListView.Static)
+        self.image_view.setUniformItemSizes(True)
+        self.image_view.setLayoutMode(QListView.Batched)
+        self.image_view.setBatchSize(100)
+        self.image_view.setIconSize(THUMBNAIL_SIZE)
+        self.image_view.setGridSize(QSize(THUMBNAIL_SIZE.width() + 20, THUMBNAIL_SIZE.height() + 40))
+        self.image_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.image_view.setModel(self.photo_model)
+        self.image_view.doubleClicked.connect(lambda index: self.modify_image(index.data(PHOTO_ID_ROLE)))
+        self.image_view.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.image_view.customContextMenuRequested.connect(self._show_context_menu)
+        main_layout.addWidget(self.image_view)
 
         self.setLayout(main_layout)
 
     def load_images_from_controller(self):
         try:
-            self.all_photos = self.photo_controller.get_all_photos()
+            self.all_photos = self.photo_controller.get_all_photos_with_person() or []
+            self._build_name_index()
             self._display_photos(self.all_photos)
         except Exception as e:
             self.logger.error(f"Erreur lors du chargement des images: {e}")
             self.show_message("Erreur", "Impossible de charger les images.")
 
+    def _build_name_index(self):
+        self.photo_names = {}
+        self.search_index = []
+        for photo in self.all_photos:
+            person = photo.personne
+            name = f"{person.nom} {person.prenom}" if person else "Inconnu"
+            self.photo_names[photo.id] = name
+            self.search_index.append((name.lower(), photo))
+
     def _display_photos(self, photos):
-        self.clear_layout(self.image_grid_layout)
-        columns = 4
-        row, col = 0, 0
-        for photo in photos:
-            image_widget = self._create_photo_item(photo)
-            self.image_grid_layout.addWidget(image_widget, row, col)
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
-        self.image_grid_widget.adjustSize()
-
-    def _create_photo_item(self, photo):
-        item_widget = QWidget()
-        item_layout = QVBoxLayout()
-        item_widget.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-
-        pixmap = QPixmap(photo.url).scaled(200, 250, Qt.KeepAspectRatio)
-        image_label = QLabel()
-        image_label.setPixmap(pixmap)
-        image_label.setAlignment(Qt.AlignCenter)
-        item_layout.addWidget(image_label)
-
-        person = self.person_controller.get_driver_by_id(photo.personne_id)
-        name = f"{person.nom} {person.prenom}" if person else "Inconnu"
-        name_label = QLabel(name)
-        name_label.setAlignment(Qt.AlignCenter)
-        item_layout.addWidget(name_label)
-
-        buttons_layout = QHBoxLayout()
-        modify_button = QPushButton("Modifier")
-        modify_button.clicked.connect(lambda: self.modify_image(photo.id))
-        buttons_layout.addWidget(modify_button)
-        delete_button = QPushButton("Supprimer")
-        delete_button.clicked.connect(lambda: self.delete_image(photo.id))
-        buttons_layout.addWidget(delete_button)
-        item_layout.addLayout(buttons_layout)
-
-        item_widget.setLayout(item_layout)
-        return item_widget
+        self.photo_model.set_photos((photo, self.photo_names.get(photo.id, "Inconnu")) for photo in photos)
+
+    def _on_selected(self, action):
+        index = self.image_view.currentIndex()
+        if not index.isValid():
+            self.show_message("Information", "Sélectionnez d'abord une image.")
+            return
+        action(index.data(PHOTO_ID_ROLE))
+
+    def _show_context_menu(self, position):
+        index = self.image_view.indexAt(position)
+        if not index.isValid():
+            return
+        photo_id = index.data(PHOTO_ID_ROLE)
+        menu = QMenu(self)
+        menu.addAction("Modifier", lambda: self.modify_image(photo_id))
+        menu.addAction("Supprimer", lambda: self.delete_image(photo_id))
+        menu.exec(self.image_view.viewport().mapToGlobal(position))
 
     def filter_images(self, text):
         if not text:
             self._display_photos(self.all_photos)
             return
-        filtered_photos = [
-            p for p in self.all_photos
-            if self.person_controller.get_driver_by_id(p.personne_id)
-            and text.lower() in (
-                f"{self.person_controller.get_driver_by_id(p.personne_id).nom} "
-                f"{self.person_controller.get_driver_by_id(p.personne_id).prenom}"
-            ).lower()
-        ]
+        text = text.lower()
+        filtered_photos = [photo for name, photo in self.search_index if text in name]
         self._display_photos(filtered_photos)
 
     def modify_image(self, photo_id):
@@ -138,11 +142,5 @@ class DISPLAY_IMAGES(QWidget):
                 self.logger.error(f"Erreur lors de la suppression: {e}")
                 self.show_message("Erreur", "Erreur lors de la suppression.")
 
-    def clear_layout(self, layout):
-        while layout.count():
-            item = layout.takeAt(0)
-            if widget := item.widget():
-                widget.deleteLater()
-
     def show_message(self, title, message):
         QMessageBox.information(self, title, message)
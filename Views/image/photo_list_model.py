@@ -0,0 +1,54 @@
+# photo_list_model.py
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PySide6.QtGui import QColor, QPixmap
+
+from Views.image.thumbnail_cache import ThumbnailCache, THUMBNAIL_SIZE
+
+PHOTO_ID_ROLE = Qt.UserRole + 1
+
+
+class PhotoListModel(QAbstractListModel):
+    """
+    Modèle de la galerie : une ligne par photo (nom affiché, miniature, id).
+    La vue ne demande data() que pour les cellules visibles ; la miniature est chargée
+    à ce moment-là par le ThumbnailCache, et la cellule est rafraîchie quand elle arrive.
+    """
+
+    def __init__(self, thumbnails=None, parent=None):
+        super().__init__(parent)
+        self.thumbnails = thumbnails or ThumbnailCache(parent=self)
+        self.thumbnails.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self._photos = []  # [(photo, nom affiché)]
+        self._rows_by_path = {}
+        self._placeholder = QPixmap(THUMBNAIL_SIZE)
+        self._placeholder.fill(QColor("#e0e0e0"))
+
+    def set_photos(self, photos_with_names):
+        self.beginResetModel()
+        self._photos = list(photos_with_names)
+        self._rows_by_path = {}
+        for row, (photo, _) in enumerate(self._photos):
+            self._rows_by_path.setdefault(photo.url, []).append(row)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._photos)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._photos):
+            return None
+        photo, name = self._photos[index.row()]
+        if role == Qt.DisplayRole:
+            return name
+        if role == Qt.DecorationRole:
+            return self.thumbnails.pixmap(photo.url) or self._placeholder
+        if role == Qt.ToolTipRole:
+            return photo.url
+        if role == PHOTO_ID_ROLE:
+            return photo.id
+        return None
+
+    def _on_thumbnail_ready(self, path):
+        for row in self._rows_by_path.get(path, ()):
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
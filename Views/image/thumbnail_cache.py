@@ -0,0 +1,122 @@
+# thumbnail_cache.py
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+
+from PySide6.QtCore import QObject, QRunnable, QSize, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+
+THUMBNAIL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".thumbnails")
+THUMBNAIL_SIZE = QSize(200, 250)
+
+
+class _ThumbnailSignals(QObject):
+    # (chemin de l'image originale, miniature décodée ou QImage nulle en cas d'échec)
+    loaded = Signal(str, QImage)
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(self, cache, path):
+        super().__init__()
+        self.cache = cache
+        self.path = path
+
+    def run(self):
+        try:
+            image = self.cache.load_image(self.path)
+        except Exception as e:
+            logging.error(f"Erreur lors de la création de la miniature de {self.path} : {e}")
+            image = QImage()
+        self.cache.signals.loaded.emit(self.path, image)
+
+
+class ThumbnailCache(QObject):
+    """
+    Miniatures des photos, persistées sur disque et décodées hors du thread graphique.
+    Une miniature est identifiée par le chemin, la date de modification et la taille du
+    fichier original : une photo remplacée produit une nouvelle miniature. Le décodage
+    (miniature existante ou réduction de l'original) se fait dans un pool de threads ;
+    seules les QImage traversent les threads, les QPixmap sont créés dans l'interface
+    et gardés en mémoire dans un cache LRU limité à memory_items éléments.
+    """
+
+    thumbnail_ready = Signal(str)  # chemin de l'image originale
+
+    def __init__(self, cache_dir=THUMBNAIL_DIR, size=THUMBNAIL_SIZE, memory_items=500,
+                 max_threads=None, parent=None):
+        super().__init__(parent)
+        self.cache_dir = os.path.normpath(cache_dir)
+        self.size = size
+        self.memory_items = memory_items
+        self._pixmaps = OrderedDict()  # {chemin: QPixmap}
+        self._pending = set()
+        self._failed = set()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads or max(2, min(4, QThreadPool.globalInstance().maxThreadCount())))
+        self.signals = _ThumbnailSignals()
+        self.signals.loaded.connect(self._on_loaded, Qt.QueuedConnection)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def thumbnail_path(self, path):
+        """Fichier de la miniature, ou None si l'original n'existe pas."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{self.size.width()}x{self.size.height()}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".jpg")
+
+    def load_image(self, path):
+        """Lit la miniature sur disque ou la génère depuis l'original (appelé dans le pool)."""
+        thumb_path = self.thumbnail_path(path)
+        if thumb_path is None:
+            return QImage()
+        if os.path.exists(thumb_path):
+            image = QImage(thumb_path)
+            if not image.isNull():
+                return image
+
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        original = reader.size()
+        if original.isValid():
+            # Le décodeur réduit directement l'image (JPEG : décodage à 1/2, 1/4, 1/8)
+            reader.setScaledSize(original.scaled(self.size, Qt.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            logging.warning(f"Impossible de lire l'image {path} : {reader.errorString()}")
+            return image
+        if image.width() > self.size.width() or image.height() > self.size.height():
+            image = image.scaled(self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        # Écriture via un fichier temporaire : un lecteur concurrent ne voit jamais de fichier partiel
+        temp_path = f"{thumb_path}.{os.getpid()}.tmp"
+        if image.save(temp_path, "JPG", 85):
+            os.replace(temp_path, thumb_path)
+        return image
+
+    def pixmap(self, path):
+        """Retourne la miniature si elle est prête ; sinon lance son chargement et retourne None."""
+        pixmap = self._pixmaps.get(path)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(path)
+            return pixmap
+        if path not in self._pending and path not in self._failed:
+            self._pending.add(path)
+            self.pool.start(_ThumbnailTask(self, path))
+        return None
+
+    def _on_loaded(self, path, image):
+        self._pending.discard(path)
+        if image.isNull():
+            self._failed.add(path)
+        else:
+            self._pixmaps[path] = QPixmap.fromImage(image)
+            while len(self._pixmaps) > self.memory_items:
+                self._pixmaps.popitem(last=False)
+        self.thumbnail_ready.emit(path)
+
+    def clear_memory(self):
+        """Vide le cache mémoire (les miniatures sur disque sont conservées)."""
+        self._pixmaps.clear()
+        self._failed.clear()
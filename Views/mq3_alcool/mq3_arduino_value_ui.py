@@ -1,12 +1,34 @@
-from PySide6.QtWidgets import QMainWindow, QLabel, QTextEdit, QVBoxLayout, QWidget
-import json
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QMainWindow, QLabel, QPlainTextEdit, QVBoxLayout, QWidget
+from collections import deque
+import time
+
+import numpy as np
+
+from Controllers.mq3_sample_buffer import MQ3_SAMPLE_DTYPE, Mq3RingBuffer, parse_mq3_line
+from Views.mq3_alcool.mq3_plot_widget import Mq3PlotWidget
 
 class Mq3ValueGui(QMainWindow):
-    def __init__(self, arduino_controller):
+    # Seuil défini dans le programme Arduino
+    SEUIL_ALCOOL = 400
+    # Rafraîchissements de l'affichage par seconde, quel que soit le débit du capteur
+    REFRESH_HZ = 10
+    # Lignes conservées dans le journal texte
+    LOG_LINES = 500
+    # Points tracés au plus (décimation min/max)
+    PLOT_POINTS = 800
+
+    def __init__(self, arduino_controller, buffer_capacity=86400):
         super().__init__()
         self.setWindowTitle("MQ3 Alcohol Sensor Monitor")
         self.arduino_controller = arduino_controller
 
+        # Mesures en mémoire fixe : les plus anciennes sont écrasées
+        self.samples = Mq3RingBuffer(buffer_capacity)
+        # Lignes reçues depuis le dernier rafraîchissement (bornées elles aussi)
+        self.pending_lines = deque(maxlen=self.LOG_LINES)
+        self.dirty = False
+
         # Créer un widget central pour le QMainWindow
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -15,22 +37,39 @@ class Mq3ValueGui(QMainWindow):
         self.status_label = QLabel("Microcontrôleur : 🔴 Déconnecté")
         self.status_label.setStyleSheet("font-weight: bold; color: red;")
 
-        self.output_display = QTextEdit()
+        self.last_value_label = QLabel("Dernière mesure : -")
+
+        self.plot = Mq3PlotWidget(threshold=self.SEUIL_ALCOOL)
+
+        # Journal texte plafonné : Qt supprime lui-même les blocs les plus anciens
+        self.output_display = QPlainTextEdit()
         self.output_display.setReadOnly(True)
+        self.output_display.setMaximumBlockCount(self.LOG_LINES)
 
         # Organiser les composants dans une mise en page verticale
         layout = QVBoxLayout()
         layout.addWidget(self.status_label)
+        layout.addWidget(self.last_value_label)
+        layout.addWidget(self.plot)
         layout.addWidget(QLabel("Mesures en temps réel :"))
         layout.addWidget(self.output_display)
         central_widget.setLayout(layout)
 
-        # Connexion des signaux du contrôleur Arduino
-        self.arduino_controller.data_received.connect(self.on_data_received)
+        # Connexion des signaux du contrôleur Arduino : mesures reçues par lots,
+        # décodées dans le thread de lecture
+        self.arduino_controller.enable_batching()
+        self.arduino_controller.samples_received.connect(self.on_samples_received)
+        self.arduino_controller.lines_received.connect(self.on_lines_received)
 
         # passer la fonction, pas son résultat
         self.arduino_controller.connection_status_changed.connect(self.update_status_label)
 
+        # L'affichage est redessiné à cadence fixe, pas à chaque mesure
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000 // self.REFRESH_HZ)
+        self.refresh_timer.timeout.connect(self.refresh_display)
+        self.refresh_timer.start()
+
     def update_status_label(self, connected):
         """
         Met à jour l'étiquette de statut selon l'état de connexion.
@@ -44,11 +83,40 @@ class Mq3ValueGui(QMainWindow):
 
     def on_data_received(self, line):
         """
-        Traite les données JSON reçues de l'Arduino et les affiche.
+        Range une mesure JSON reçue ligne par ligne (signal data_received) ; l'affichage suit au prochain rafraîchissement.
         """
-        try:
-            data = json.loads(line)
-            msg = f"Alcool : {data['alcohol']}, État numérique : {data['digital']}, Alerte : {data['alert']}"
-        except json.JSONDecodeError:
-            msg = f"[Texte brut] {line}"
-        self.output_display.append(msg)
+        sample = parse_mq3_line(line)
+        if sample is None:
+            self.on_lines_received([line])
+        else:
+            self.on_samples_received(np.array([sample], dtype=MQ3_SAMPLE_DTYPE))
+
+    def on_samples_received(self, samples):
+        """Range un lot de mesures décodées par le contrôleur (signal samples_received)."""
+        self.samples.extend(samples)
+        # Seules les dernières lignes seront visibles : inutile de formater les autres
+        for sample in samples[-self.LOG_LINES:]:
+            self.pending_lines.append(f"Alcool : {sample['alcohol']:g}, État numérique : {sample['digital']}, "
+                                      f"Alerte : {bool(sample['alert'])}")
+        self.dirty = True
+
+    def on_lines_received(self, lines):
+        """Lignes qui ne sont pas des mesures (signal lines_received)."""
+        self.pending_lines.extend(f"[Texte brut] {line}" for line in lines[-self.LOG_LINES:])
+        self.dirty = True
+
+    def refresh_display(self):
+        """Met à jour la courbe (données décimées) et le journal en une seule fois."""
+        if not self.dirty or not self.isVisible():
+            return
+        self.dirty = False
+        if self.pending_lines:
+            self.output_display.appendPlainText("\n".join(self.pending_lines))
+            self.pending_lines.clear()
+        if len(self.samples):
+            now = time.time()
+            last = self.samples.latest(1)[0]
+            self.last_value_label.setText(f"Dernière mesure : {last['alcohol']:g} "
+                                          f"({'alerte' if last['alert'] else 'normal'})")
+            times, values = self.samples.decimated(self.PLOT_POINTS, since=now - self.plot.window_s)
+            self.plot.set_data(times, values, now)
@@ -0,0 +1,60 @@
+from PySide6.QtCore import QPointF, Qt
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import QWidget
+
+
+class Mq3PlotWidget(QWidget):
+    """
+    Courbe temps réel de la valeur d'alcool, dessinée avec QPainter (pas de dépendance
+    de tracé). set_data() reçoit des données déjà décimées : le coût d'un rafraîchissement
+    dépend de la largeur du widget, pas de la durée d'enregistrement.
+    """
+
+    def __init__(self, threshold=400, window_s=120, y_max=1023, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold
+        self.window_s = window_s
+        self.y_max = y_max
+        self._times = []
+        self._values = []
+        self._end_time = 0.0
+        self.setMinimumHeight(200)
+
+    def set_data(self, times, values, end_time):
+        self._times = times
+        self._values = values
+        self._end_time = end_time
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self.rect().adjusted(40, 10, -10, -20)
+        painter.fillRect(self.rect(), QColor("white"))
+        painter.setPen(QColor("#999999"))
+        painter.drawRect(rect)
+        painter.drawText(2, rect.top() + 10, str(self.y_max))
+        painter.drawText(2, rect.bottom(), "0")
+        painter.drawText(rect.left(), self.height() - 4, f"-{self.window_s} s")
+        painter.drawText(rect.right() - 30, self.height() - 4, "maint.")
+
+        def to_y(value):
+            return rect.bottom() - min(max(value, 0.0), self.y_max) / self.y_max * rect.height()
+
+        # Seuil d'alerte
+        threshold_y = to_y(self.threshold)
+        painter.setPen(QPen(QColor("red"), 1, Qt.DashLine))
+        painter.drawLine(QPointF(rect.left(), threshold_y), QPointF(rect.right(), threshold_y))
+
+        if len(self._values) < 2:
+            painter.end()
+            return
+        start_time = self._end_time - self.window_s
+        scale_x = rect.width() / self.window_s
+        polygon = QPolygonF([
+            QPointF(rect.left() + (t - start_time) * scale_x, to_y(v))
+            for t, v in zip(self._times.tolist(), self._values.tolist())
+        ])
+        painter.setPen(QPen(QColor("#1565c0"), 1.5))
+        painter.drawPolyline(polygon)
+        painter.end()
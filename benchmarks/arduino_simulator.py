@@ -0,0 +1,316 @@
+"""
+Arduino MQ3 simulé sur un pseudo-terminal, pour faire tourner ArduinoController et
+Mq3ValueGui sans matériel (machine Linux sans écran comprise).
+
+Le simulateur crée une paire pty, écrit des mesures réalistes côté maître et répond aux
+commandes comme le programme Arduino :
+  - lignes JSON {"alcohol": .., "digital": .., "alert": ..} au départ ;
+  - "BIN <débit>" : répond "OK BIN <débit>" puis passe aux trames binaires (serial_framing) ;
+  - "JSON" : revient aux lignes JSON.
+
+Mesures : niveau de base qui dérive lentement, bruit gaussien, épisodes d'alerte (souffle
+chargé en alcool : montée puis décroissance) à intervalles aléatoires. Incidents : coupures
+silencieuses périodiques (faux contact) et débranchement définitif (fermeture du pty).
+Avec emulate_baud, le débit de la liaison série est respecté : les mesures en attente
+d'envoi s'accumulent dans un tampon d'émission borné et les plus récentes sont perdues
+quand il déborde, comme sur la carte.
+
+Usage (Linux) :
+    python benchmarks/arduino_simulator.py --rate 20 --gui
+    python benchmarks/arduino_simulator.py --rate 50          # affiche le port, Ctrl-C pour arrêter
+"""
+import argparse
+import json
+import math
+import os
+import pty
+import random
+import select
+import sys
+import threading
+import time
+import tty
+from collections import deque
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from Controllers.serial_framing import encode_frame  # noqa: E402
+
+
+class ArduinoSimulator:
+    # Délai entre la réponse "OK BIN" et la première trame (changement de débit de la carte)
+    SWITCH_DELAY = 0.02
+
+    def __init__(self, rate=10.0, baseline=120.0, noise=8.0, threshold=400, alert_every=30.0,
+                 alert_duration=6.0, alert_peak=700.0, dropout_every=None, dropout_duration=2.0,
+                 disconnect_after=None, supports_binary=True, emulate_baud=False, baudrate=9600,
+                 tx_queue=64, seed=None):
+        self.rate = rate
+        self.baseline = baseline
+        self.noise = noise
+        self.threshold = threshold
+        self.alert_every = alert_every
+        self.alert_duration = alert_duration
+        self.alert_peak = alert_peak
+        self.dropout_every = dropout_every
+        self.dropout_duration = dropout_duration
+        self.disconnect_after = disconnect_after
+        self.supports_binary = supports_binary
+        self.emulate_baud = emulate_baud
+        self.base_baudrate = baudrate
+        self.tx_queue_size = tx_queue
+        self.random = random.Random(seed)
+
+        self.port = None
+        self.binary = False
+        self.baudrate = baudrate
+        self.connected = False
+        # Instant (perf_counter) de production de chaque mesure effectivement envoyée, dans l'ordre
+        self.sent_times = []
+        self.generated = 0
+        self.dropped_at_source = 0
+        self.bytes_sent = 0
+        self.alerts = 0
+
+        self._master = None
+        self._slave = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._queue = deque()
+        self._commands = bytearray()
+        self._seq = 0
+        self._tx_free_at = 0.0
+        self._paused_until = 0.0
+        self._alert_start = None
+        self._next_alert = None
+
+    # --- cycle de vie -------------------------------------------------------------------
+
+    def open(self):
+        """Crée la paire pty et retourne le chemin du port à ouvrir côté application."""
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self.connected = True
+        return self.port
+
+    def start(self):
+        if self._master is None:
+            self.open()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="arduino-simulator", daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        self._disconnect()
+        if self._slave is not None:
+            os.close(self._slave)
+            self._slave = None
+
+    def stats(self):
+        return {
+            "port": self.port, "protocol": "binary" if self.binary else "json", "baudrate": self.baudrate,
+            "generated": self.generated, "sent": len(self.sent_times), "dropped_at_source": self.dropped_at_source,
+            "bytes_sent": self.bytes_sent, "alerts": self.alerts, "connected": self.connected,
+        }
+
+    # --- boucle d'émission --------------------------------------------------------------
+
+    def _run(self):
+        start = time.perf_counter()
+        next_sample = start
+        self._next_alert = self._draw_next_alert(0.0)
+        period = 1.0 / self.rate
+        while not self._stop.is_set() and self.connected:
+            now = time.perf_counter()
+            elapsed = now - start
+            if self.disconnect_after is not None and elapsed >= self.disconnect_after:
+                self._disconnect()
+                break
+            while next_sample <= now:
+                self._produce(next_sample, next_sample - start)
+                next_sample += period
+            self._drain(now)
+            wake_at = next_sample
+            if self._queue:
+                wake_at = min(wake_at, max(self._tx_free_at, self._paused_until))
+            self._wait_for_commands(max(0.0, wake_at - time.perf_counter()))
+
+    def _produce(self, produced_at, elapsed):
+        if self._in_dropout(elapsed):
+            return
+        self.generated += 1
+        alcohol = self._reading(elapsed)
+        sample = (produced_at, int(alcohol), int(alcohol >= self.threshold), alcohol >= self.threshold)
+        if len(self._queue) >= self.tx_queue_size:
+            self.dropped_at_source += 1
+            return
+        self._queue.append(sample)
+
+    def _drain(self, now):
+        if now < self._paused_until:
+            return
+        chunks = []
+        produced = []
+        while self._queue and (not self.emulate_baud or self._tx_free_at <= now):
+            produced_at, alcohol, digital, alert = self._queue.popleft()
+            if self.binary:
+                payload = encode_frame(self._seq, alcohol, digital, alert)
+            else:
+                payload = (json.dumps({"alcohol": alcohol, "digital": digital, "alert": alert}) + "\n").encode()
+            self._seq = (self._seq + 1) & 0xFF
+            chunks.append(payload)
+            produced.append(produced_at)
+            if self.emulate_baud:
+                self._tx_free_at = max(self._tx_free_at, now) + len(payload) * 10 / self.baudrate
+        if chunks:
+            # Les instants sont enregistrés avant l'écriture : le lecteur peut traiter les
+            # octets avant que write() ne rende la main
+            self.sent_times.extend(produced)
+            self._write(b"".join(chunks))
+
+    def _write(self, data):
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(self._master, view)
+            except OSError:
+                self.connected = False
+                return
+            self.bytes_sent += written
+            view = view[written:]
+
+    # --- commandes reçues de l'application ----------------------------------------------
+
+    def _wait_for_commands(self, timeout):
+        try:
+            readable, _, _ = select.select([self._master], [], [], timeout)
+            if not readable:
+                return
+            self._commands += os.read(self._master, 1024)
+        except OSError:
+            self.connected = False
+            return
+        while b"\n" in self._commands:
+            line, _, rest = bytes(self._commands).partition(b"\n")
+            self._commands = bytearray(rest)
+            self._handle_command(line.decode(errors="replace").strip())
+
+    def _handle_command(self, command):
+        if command.startswith("BIN ") and self.supports_binary and not self.binary:
+            baudrate = int(command.split()[1])
+            self._write(f"OK BIN {baudrate}\n".encode())
+            self.binary = True
+            self.baudrate = baudrate
+            self._paused_until = time.perf_counter() + self.SWITCH_DELAY
+        elif command == "JSON" and self.binary:
+            self.binary = False
+            self.baudrate = self.base_baudrate
+
+    # --- modèle du capteur --------------------------------------------------------------
+
+    def _reading(self, elapsed):
+        drift = 15.0 * math.sin(2 * math.pi * elapsed / 300.0)
+        value = self.baseline + drift + self.random.gauss(0.0, self.noise) + self._alert_level(elapsed)
+        return min(max(value, 0.0), 1023.0)
+
+    def _alert_level(self, elapsed):
+        if self._alert_start is None and self._next_alert is not None and elapsed >= self._next_alert:
+            self._alert_start = elapsed
+            self.alerts += 1
+        if self._alert_start is None:
+            return 0.0
+        x = (elapsed - self._alert_start) / self.alert_duration
+        if x >= 1.0:
+            self._alert_start = None
+            self._next_alert = self._draw_next_alert(elapsed)
+            return 0.0
+        # Montée rapide (20 % de l'épisode) puis décroissance exponentielle
+        rise = min(x / 0.2, 1.0)
+        decay = math.exp(-3.0 * max(x - 0.2, 0.0))
+        return (self.alert_peak - self.baseline) * rise * decay
+
+    def _draw_next_alert(self, elapsed):
+        if not self.alert_every:
+            return None
+        return elapsed + self.random.expovariate(1.0 / self.alert_every)
+
+    def _in_dropout(self, elapsed):
+        if not self.dropout_every:
+            return False
+        return elapsed % self.dropout_every >= self.dropout_every - self.dropout_duration
+
+    def _disconnect(self):
+        self.connected = False
+        if self._master is not None:
+            os.close(self._master)
+            self._master = None
+
+
+def run_gui(simulator):
+    """Ouvre Mq3ValueGui branché sur le simulateur."""
+    import serial
+    from PySide6.QtWidgets import QApplication
+    from Controllers.arduino_controller import ArduinoController
+    from Views.mq3_alcool.mq3_arduino_value_ui import Mq3ValueGui
+
+    app = QApplication(sys.argv)
+    controller = ArduinoController(protocol=ArduinoController.PROTOCOL_AUTO if simulator.supports_binary
+                                   else ArduinoController.PROTOCOL_JSON)
+    controller.serial_connection = serial.Serial(simulator.port, baudrate=controller.baudrate,
+                                                 timeout=controller.READ_TIMEOUT)
+    window = Mq3ValueGui(controller)
+    window.show()
+    controller.start_reading()
+    controller.connection_status_changed.emit(True)
+    code = app.exec()
+    controller.close_connection()
+    return code
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arduino MQ3 simulé sur un pseudo-terminal")
+    parser.add_argument("--rate", type=float, default=10.0, help="mesures par seconde")
+    parser.add_argument("--noise", type=float, default=8.0)
+    parser.add_argument("--alert-every", type=float, default=30.0, help="intervalle moyen entre alertes (s), 0 pour aucune")
+    parser.add_argument("--alert-duration", type=float, default=6.0)
+    parser.add_argument("--dropout-every", type=float, default=None, help="coupure silencieuse toutes les N s")
+    parser.add_argument("--dropout-duration", type=float, default=2.0)
+    parser.add_argument("--disconnect-after", type=float, default=None, help="débranchement après N s")
+    parser.add_argument("--json-only", action="store_true", help="ignore la négociation binaire (ancien programme)")
+    parser.add_argument("--emulate-baud", action="store_true", help="respecte le débit de la liaison série")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--gui", action="store_true", help="ouvre la fenêtre MQ3 sur le port simulé")
+    args = parser.parse_args()
+
+    simulator = ArduinoSimulator(
+        rate=args.rate, noise=args.noise, alert_every=args.alert_every, alert_duration=args.alert_duration,
+        dropout_every=args.dropout_every, dropout_duration=args.dropout_duration,
+        disconnect_after=args.disconnect_after, supports_binary=not args.json_only,
+        emulate_baud=args.emulate_baud, seed=args.seed,
+    )
+    port = simulator.start()
+    print(f"Arduino simulé sur {port}")
+    try:
+        if args.gui:
+            return run_gui(simulator)
+        while simulator.connected:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.close()
+        print(simulator.stats())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
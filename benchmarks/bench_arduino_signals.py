@@ -0,0 +1,113 @@
+"""
+Mesure la latence de la file d'événements Qt entre le thread de lecture série et l'interface,
+en émission ligne par ligne (data_received) puis en émission groupée (samples_received).
+
+Un pseudo-terminal remplace l'Arduino : un thread y écrit des mesures JSON à cadence fixe
+(la valeur "alcohol" porte le numéro de la mesure), et le slot côté interface calcule le
+délai entre l'écriture et le traitement. --slot-cost-ms simule le travail fait par l'interface
+à chaque événement reçu (décodage, ajout au journal...).
+
+Usage (Linux) :
+    python benchmarks/bench_arduino_signals.py --rates 100 1000 --seconds 5
+"""
+import argparse
+import json
+import os
+import pty
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def write_samples(fd, rate, seconds, sent_at):
+    start = time.perf_counter()
+    for seq in range(int(rate * seconds)):
+        delay = start + seq / rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        sent_at[seq] = time.perf_counter()
+        os.write(fd, json.dumps({"alcohol": seq, "digital": 0, "alert": False}).encode() + b"\n")
+
+
+def run(app, mode, rate, seconds, slot_cost_s):
+    import serial
+    from PySide6.QtCore import QTimer
+    from Controllers.arduino_controller import ArduinoController
+
+    master, slave = pty.openpty()
+    controller = ArduinoController()
+    controller.serial_connection = serial.Serial(os.ttyname(slave), timeout=controller.READ_TIMEOUT)
+    sent_at, latencies = {}, []
+    events = [0]
+
+    def on_line(line):
+        events[0] += 1
+        seq = int(json.loads(line)["alcohol"])
+        latencies.append(time.perf_counter() - sent_at[seq])
+        busy_wait(slot_cost_s)
+
+    def on_samples(samples):
+        events[0] += 1
+        now = time.perf_counter()
+        latencies.extend(now - sent_at[int(seq)] for seq in samples["alcohol"])
+        busy_wait(slot_cost_s)
+
+    if mode == "ligne":
+        controller.data_received.connect(on_line)
+    else:
+        controller.enable_batching()
+        controller.samples_received.connect(on_samples)
+    controller.start_reading()
+
+    writer = threading.Thread(target=write_samples, args=(master, rate, seconds, sent_at), daemon=True)
+    writer.start()
+    # Laisse le temps à la file de se vider après la dernière écriture
+    QTimer.singleShot(int((seconds + 2) * 1000), app.quit)
+    app.exec()
+
+    controller.stop_reading()
+    controller.serial_connection.close()
+    os.close(master)
+    os.close(slave)
+
+    latencies.sort()
+    received = len(latencies)
+    return {
+        "mode": mode, "rate_hz": rate, "sent": len(sent_at), "received": received, "gui_events": events[0],
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p95_ms": latencies[int(0.95 * (received - 1))] * 1000 if latencies else None,
+        "max_ms": latencies[-1] * 1000 if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rates", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--slot-cost-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    from PySide6.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+
+    print(f"{'mode':<8}{'Hz':>6}{'envoyées':>10}{'reçues':>9}{'évts GUI':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for rate in args.rates:
+        for mode in ("ligne", "groupé"):
+            r = run(app, mode, rate, args.seconds, args.slot_cost_ms / 1000)
+            print(f"{r['mode']:<8}{r['rate_hz']:>6}{r['sent']:>10}{r['received']:>9}{r['gui_events']:>10}"
+                  f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['max_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
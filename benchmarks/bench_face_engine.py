@@ -0,0 +1,110 @@
+"""
+Mesure la latence par image et la mémoire résidente (RSS) de chaque profil de FaceEngineManager.
+
+Chaque profil est exécuté dans un sous-processus séparé pour que la mémoire mesurée
+ne soit pas faussée par les modèles chargés par les autres profils.
+
+Usage :
+    python benchmarks/bench_face_engine.py --image captured_images/adhule.png --frames 50
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+
+def current_rss_mb():
+    """RSS courante du processus en Mo (Linux : /proc/self/statm)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_profile(profile, image_path, frames, warmup):
+    import cv2
+    from Views.Home.face_engine_manager import FaceEngineManager
+
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    engine = FaceEngineManager.from_profile(profile)
+    load_s = time.perf_counter() - start
+    rss_loaded = current_rss_mb()
+
+    frame = cv2.imread(image_path)
+    if frame is None:
+        raise SystemExit(f"Image illisible : {image_path}")
+
+    for _ in range(warmup):
+        engine.detect_faces(frame)
+
+    latencies = []
+    faces = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        faces = engine.detect_faces(frame)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return {
+        "profil": profile,
+        "modele": engine.model_name,
+        "modules": engine.allowed_modules or "tous",
+        "det_size": list(engine.det_size),
+        "chargement_s": round(load_s, 2),
+        "rss_modeles_mo": round(rss_loaded - rss_before, 1),
+        "rss_total_mo": round(current_rss_mb(), 1),
+        "latence_moy_ms": round(statistics.mean(latencies), 1),
+        "latence_p50_ms": round(latencies[len(latencies) // 2], 1),
+        "latence_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+        "visages": len(faces),
+    }
+
+
+def main():
+    from Views.Home.face_engine_manager import ENGINE_PROFILES
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--image", default=os.path.join(ROOT, "captured_images", "adhule.png"))
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--profiles", nargs="*", default=list(ENGINE_PROFILES))
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_profile(args.child, args.image, args.frames, args.warmup)))
+        return
+
+    rows = []
+    for profile in args.profiles:
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", profile, "--image", args.image,
+             "--frames", str(args.frames), "--warmup", str(args.warmup)],
+            capture_output=True, text=True, cwd=ROOT)
+        if output.returncode != 0:
+            print(f"[{profile}] échec :\n{output.stderr.strip()}")
+            continue
+        rows.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    header = f"{'profil':<10}{'modèle':<11}{'det_size':<11}{'charg. s':>9}{'RSS Mo':>9}{'moy ms':>9}{'p50 ms':>9}{'p95 ms':>9}{'visages':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        det_size = "x".join(str(v) for v in row["det_size"])
+        print(f"{row['profil']:<10}{row['modele']:<11}{det_size:<11}{row['chargement_s']:>9}"
+              f"{row['rss_total_mo']:>9}{row['latence_moy_ms']:>9}{row['latence_p50_ms']:>9}"
+              f"{row['latence_p95_ms']:>9}{row['visages']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Débit et latence de bout en bout de la chaîne série : Arduino simulé (arduino_simulator)
+-> ArduinoController (thread de lecture) -> Mq3ValueGui (fenêtre réelle, hors écran).
+
+Pour chaque protocole et chaque cadence, mesure :
+  - envoyées / reçues / perdues (perdues à la source quand la liaison est saturée, avec
+    --emulate-baud, et perdues en route entre le pty et l'interface) ;
+  - latence entre la production d'une mesure et son traitement par l'interface (p50, p95, max) ;
+  - nombre d'événements reçus par l'interface ;
+  - temps CPU du thread de lecture et du processus, en % d'un cœur.
+
+Les mesures arrivent dans l'ordre et le pty ne perd rien : la n-ième mesure reçue par
+l'interface est la n-ième envoyée par le simulateur.
+
+Usage (Linux) :
+    python benchmarks/bench_serial_throughput.py --rates 20 200 1000 --seconds 5
+    python benchmarks/bench_serial_throughput.py --rates 20 100 --emulate-baud --json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from arduino_simulator import ArduinoSimulator  # noqa: E402
+
+
+def run(app, protocol, rate, seconds, emulate_baud, seed):
+    import serial
+    from PySide6.QtCore import Qt, QTimer
+    from Controllers.arduino_controller import ArduinoController
+    from Views.mq3_alcool.mq3_arduino_value_ui import Mq3ValueGui
+
+    simulator = ArduinoSimulator(rate=rate, alert_every=2.0, alert_duration=1.0, emulate_baud=emulate_baud,
+                                 supports_binary=protocol == "binary", seed=seed)
+    port = simulator.open()
+    controller = ArduinoController(protocol=ArduinoController.PROTOCOL_AUTO if protocol == "binary"
+                                   else ArduinoController.PROTOCOL_JSON)
+    controller.serial_connection = serial.Serial(port, baudrate=controller.baudrate, timeout=controller.READ_TIMEOUT)
+    window = Mq3ValueGui(controller, buffer_capacity=max(1024, int(rate * seconds * 2)))
+    window.show()
+
+    latencies = []
+    events = [0]
+    reader_cpu = [0.0]
+    active_protocol = [None]
+    framing = {}
+
+    def on_samples(samples):
+        # Connecté après la fenêtre : s'exécute une fois le lot traité par l'interface
+        now = time.perf_counter()
+        events[0] += 1
+        first = len(latencies)
+        sent = simulator.sent_times[first:first + len(samples)]
+        latencies.extend(now - produced_at for produced_at in sent)
+
+    def in_reader_thread(_samples):
+        # Appelé dans le thread de lecture : temps CPU consommé par ce thread depuis son démarrage
+        reader_cpu[0] = time.thread_time()
+
+    controller.samples_received.connect(on_samples)
+    controller.samples_received.connect(in_reader_thread, Qt.DirectConnection)
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    simulator.start()
+    controller.start_reading()
+
+    def stop_simulator():
+        # Relevé avant l'arrêt : sans trame, le lecteur finit par revenir au JSON
+        active_protocol[0] = controller.active_protocol
+        framing.update(controller.framing_stats())
+        simulator.stop()
+
+    QTimer.singleShot(int(seconds * 1000), stop_simulator)
+    # Laisse le temps à la file de se vider après la dernière écriture
+    QTimer.singleShot(int((seconds + 1.5) * 1000), app.quit)
+    app.exec()
+    wall = time.perf_counter() - wall_start
+    process_cpu = time.process_time() - cpu_start
+
+    controller.stop_reading()
+    controller.serial_connection.close()
+    window.close()
+    simulator.close()
+
+    stats = simulator.stats()
+    latencies.sort()
+    received = len(latencies)
+    return {
+        "protocol": active_protocol[0], "rate_hz": rate, "generated": stats["generated"], "sent": stats["sent"],
+        "received": received, "dropped_at_source": stats["dropped_at_source"],
+        "dropped_in_transit": stats["sent"] - received, "gui_events": events[0],
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p95_ms": latencies[int(0.95 * (received - 1))] * 1000 if latencies else None,
+        "max_ms": latencies[-1] * 1000 if latencies else None,
+        "reader_cpu_pct": 100 * reader_cpu[0] / wall, "process_cpu_pct": 100 * process_cpu / wall,
+        "bytes_sent": stats["bytes_sent"], **framing,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rates", type=float, nargs="+", default=[20, 200, 1000])
+    parser.add_argument("--protocols", nargs="+", choices=["json", "binary"], default=["json", "binary"])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--emulate-baud", action="store_true", help="limite le simulateur au débit de la liaison")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="résultats au format JSON")
+    args = parser.parse_args()
+
+    from PySide6.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+
+    results = []
+    if not args.json:
+        print(f"{'protocole':<10}{'Hz':>7}{'envoyées':>10}{'reçues':>9}{'perdues':>9}{'évts GUI':>10}"
+              f"{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'CPU lect.':>11}{'CPU proc.':>11}")
+    for rate in args.rates:
+        for protocol in args.protocols:
+            r = run(app, protocol, rate, args.seconds, args.emulate_baud, args.seed)
+            results.append(r)
+            if args.json:
+                continue
+
+            def ms(value):
+                return f"{value:>9.1f}" if value is not None else f"{'-':>9}"
+            print(f"{r['protocol']:<10}{r['rate_hz']:>7g}{r['sent']:>10}{r['received']:>9}"
+                  f"{r['dropped_at_source'] + r['dropped_in_transit']:>9}{r['gui_events']:>10}"
+                  f"{ms(r['p50_ms'])}{ms(r['p95_ms'])}{ms(r['max_ms'])}"
+                  f"{r['reader_cpu_pct']:>10.1f}%{r['process_cpu_pct']:>10.1f}%")
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,69 @@
+import time
+
+_START_TIME = time.perf_counter()
+
 import sys
 import os
 from PySide6.QtWidgets import QApplication, QMessageBox
-from Views.Home.main_window import MAINWINDOW
+from PySide6.QtCore import Qt, QTimer
 from Views.Home.login_page import LOGINWINDOW
-from Views.Home.webcam_page import ACCER_WEBCAMERA
 from Controllers.arduino_controller import ArduinoController
-from Views.mq3_alcool.mq3_arduino_value_ui import Mq3ValueGui
+
+
+class LazyWindows:
+    """
+    Construit les fenêtres secondaires (et leurs imports lourds : insightface, cv2,
+    vues d'administration) seulement au premier signal qui les demande.
+    Seule la fenêtre de connexion est créée au lancement.
+    """
+
+    def __init__(self, login, arduino_controller):
+        self.login = login
+        self.arduino_controller = arduino_controller
+        self._windows = {}
+        self.alcohol_test = None
+
+    def _get(self, key, factory):
+        window = self._windows.get(key)
+        if window is None:
+            start = time.perf_counter()
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                window = factory()
+            finally:
+                QApplication.restoreOverrideCursor()
+            self._windows[key] = window
+            print(f"[Démarrage] Fenêtre '{key}' construite en {time.perf_counter() - start:.2f} s")
+        return window
+
+    def _create_main_window(self):
+        from Views.Home.main_window import MAINWINDOW
+        window = MAINWINDOW()
+        window.login_signal.connect(self.login.show)
+        return window
+
+    def _create_webcam(self):
+        from Controllers.alcool_test_controller import ALCOOL_TEST_CONTROLLER
+        from Views.Home.webcam_page import ACCER_WEBCAMERA
+        # Chaque chauffeur reconnu passe un test d'alcool sur les mesures du capteur MQ3
+        self.alcohol_test = ALCOOL_TEST_CONTROLLER(self.arduino_controller)
+        webcam = ACCER_WEBCAMERA(alcohol_test=self.alcohol_test)
+        webcam.mainwindow_signal.connect(self.show_main_window)
+        return webcam
+
+    def _create_arduino_monitor(self):
+        from Views.mq3_alcool.mq3_arduino_value_ui import Mq3ValueGui
+        return Mq3ValueGui(self.arduino_controller)
+
+    def show_main_window(self):
+        self._get("principale", self._create_main_window).show()
+
+    def show_webcam(self):
+        self._get("reconnaissance", self._create_webcam).show()
+
+    def show_arduino_monitor(self):
+        self._get("mq3", self._create_arduino_monitor).show()
+
 
 if __name__ == "__main__":
     try:
@@ -27,22 +85,20 @@ if __name__ == "__main__":
             QMessageBox.warning(
                 None, "Warning", f"Stylesheet not found at {css_path}")
 
-        # Instanciation des fenêtres
-        window = MAINWINDOW()
+        # Instanciation de la seule fenêtre de connexion ; les autres sont construites à la demande
         arduino_controller = ArduinoController()
         login = LOGINWINDOW(arduino_controller)
-        webcam = ACCER_WEBCAMERA()
-        arduino=Mq3ValueGui(arduino_controller)
+        windows = LazyWindows(login, arduino_controller)
 
         # Connexion des signaux
-        login.home_page_signal.connect(window.show)
-        login.webcam_page_signal.connect(webcam.show)
-        window.login_signal.connect(login.show)
-        webcam.mainwindow_signal.connect(window.show)
-        login.arduino_value_signal.connect(arduino.show)
+        login.home_page_signal.connect(windows.show_main_window)
+        login.webcam_page_signal.connect(windows.show_webcam)
+        login.arduino_value_signal.connect(windows.show_arduino_monitor)
 
         # Afficher la fenêtre de connexion
         login.show()
+        QTimer.singleShot(0, lambda: print(
+            f"[Démarrage] Fenêtre de connexion affichée en {time.perf_counter() - _START_TIME:.2f} s"))
         sys.exit(app.exec())
     except Exception as e:
         error_message = f"An unexpected error occurred: {e}"
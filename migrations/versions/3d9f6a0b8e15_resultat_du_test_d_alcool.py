@@ -0,0 +1,34 @@
+"""resultat du test d'alcool
+
+Revision ID: 3d9f6a0b8e15
+Revises: b7d4e91c2f60
+Create Date: 2026-10-18 16:02:41.518374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d9f6a0b8e15'
+down_revision: Union[str, None] = 'b7d4e91c2f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('historiques', sa.Column('resultat', sa.String(length=20), nullable=True))
+    op.add_column('historiques', sa.Column('alcool_max', sa.Float(), nullable=True))
+    op.add_column('historiques', sa.Column('alcool_moyen', sa.Float(), nullable=True))
+    op.add_column('historiques', sa.Column('duree_depassement', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('historiques', 'duree_depassement')
+    op.drop_column('historiques', 'alcool_moyen')
+    op.drop_column('historiques', 'alcool_max')
+    op.drop_column('historiques', 'resultat')
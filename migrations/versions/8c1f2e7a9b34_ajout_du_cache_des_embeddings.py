@@ -0,0 +1,42 @@
+"""ajout du cache des embeddings
+
+Revision ID: 8c1f2e7a9b34
+Revises: 3fefeb5fdd42
+Create Date: 2026-10-18 09:12:27.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f2e7a9b34'
+down_revision: Union[str, None] = '3fefeb5fdd42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('embeddings_visages',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('image_id', sa.Integer(), nullable=False),
+    sa.Column('chemin', sa.String(length=255), nullable=False),
+    sa.Column('mtime_ns', sa.BigInteger(), nullable=False),
+    sa.Column('taille', sa.Integer(), nullable=False),
+    sa.Column('modele', sa.String(length=50), nullable=False),
+    sa.Column('vecteur', sa.LargeBinary(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['image_id'], ['images.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('image_id', 'modele', name='uq_embedding_image_modele')
+    )
+    op.create_index(op.f('ix_embeddings_visages_id'), 'embeddings_visages', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_embeddings_visages_id'), table_name='embeddings_visages')
+    op.drop_table('embeddings_visages')
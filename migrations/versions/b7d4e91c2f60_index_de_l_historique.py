@@ -0,0 +1,32 @@
+"""index de l'historique
+
+Revision ID: b7d4e91c2f60
+Revises: 8c1f2e7a9b34
+Create Date: 2026-10-18 14:37:05.261948
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d4e91c2f60'
+down_revision: Union[str, None] = '8c1f2e7a9b34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_historiques_jour_heure_event_type', 'historiques', ['jour_heure', 'event_type'], unique=False)
+    op.create_index('ix_historiques_chauffeur_id_jour_heure', 'historiques', ['chauffeur_id', 'jour_heure'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # MySQL a supprimé l'index implicite de la clé étrangère (couvert par le composite) :
+    # on le recrée sous son nom d'origine avant de retirer le composite
+    op.create_index('chauffeur_id', 'historiques', ['chauffeur_id'], unique=False)
+    op.drop_index('ix_historiques_chauffeur_id_jour_heure', table_name='historiques')
+    op.drop_index('ix_historiques_jour_heure_event_type', table_name='historiques')
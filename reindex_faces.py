@@ -0,0 +1,80 @@
+"""
+(Ré)indexe les embeddings de visages de la table images, ou des seules photos d'un dossier.
+
+Les photos sont décodées dans un pool de threads et encodées dans un pool de processus ;
+les embeddings sont écrits par lots dans embeddings_visages, où FaceDatabase.load() les
+relit ensuite sans rien ré-encoder. Les photos dont le cache est encore valide sont
+ignorées, sauf avec --force.
+
+Usage :
+    python reindex_faces.py                       # toute la table images
+    python reindex_faces.py --directory captured_images --processes 4 --threads 2
+    python reindex_faces.py --force --profile leger --json
+"""
+import argparse
+import json
+import os
+
+from Controllers.image_controller import IMAGE_CONTROLLER
+from Views.Home.bulk_encoder import BulkEncoder
+from Views.Home.face_engine_manager import ENGINE_PROFILES, DEFAULT_PROFILE
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+def photos_in_directory(photos, directory):
+    """Filtre les photos enregistrées dont le fichier se trouve sous `directory`."""
+    root = os.path.join(os.path.abspath(directory), "")
+    return [photo for photo in photos if os.path.abspath(photo.url).startswith(root)]
+
+
+def unregistered_files(photos, directory):
+    """Fichiers image du dossier qui ne correspondent à aucune ligne de la table images."""
+    known = {os.path.abspath(photo.url) for photo in photos}
+    found = []
+    for folder, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.abspath(os.path.join(folder, name))
+            if name.lower().endswith(IMAGE_EXTENSIONS) and path not in known:
+                found.append(path)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--directory", help="ne traiter que les photos enregistrées sous ce dossier")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, choices=sorted(ENGINE_PROFILES))
+    parser.add_argument("--processes", type=int, default=None,
+                        help="processus d'encodage (0 : dans le processus courant ; défaut : moitié des cœurs)")
+    parser.add_argument("--threads", type=int, default=None, help="threads ONNX par processus")
+    parser.add_argument("--decode-threads", type=int, default=4)
+    parser.add_argument("--write-batch", type=int, default=256, help="embeddings écrits par transaction")
+    parser.add_argument("--force", action="store_true", help="ré-encoder même les photos déjà en cache")
+    parser.add_argument("--json", action="store_true", help="afficher le rapport final en JSON")
+    args = parser.parse_args()
+
+    photos = list(IMAGE_CONTROLLER().iter_photos())
+    if args.directory:
+        orphans = unregistered_files(photos, args.directory)
+        photos = photos_in_directory(photos, args.directory)
+        if orphans:
+            print(f"{len(orphans)} fichier(s) du dossier ne sont liés à aucun chauffeur (table images) et sont ignorés.")
+
+    encoder = BulkEncoder(profile=args.profile, processes=args.processes, threads_per_process=args.threads,
+                          decode_threads=args.decode_threads, write_batch=args.write_batch)
+    stats = encoder.encode(photos, force=args.force)
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+    print(f"Photos            : {stats['total']}")
+    print(f"  encodées        : {stats['encoded']}")
+    print(f"  sans visage     : {stats['no_face']}")
+    print(f"  déjà en cache   : {stats['cached']}")
+    print(f"  illisibles      : {stats['unreadable']}")
+    print(f"  introuvables    : {stats['missing']}")
+    print(f"Durée             : {stats['elapsed_s']:.1f} s ({stats['images_per_s']:.1f} images/s)")
+
+
+if __name__ == "__main__":
+    main()